@@ -0,0 +1,171 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+import simplecli
+
+TARGET_MODULE = "simplecli.simplecli"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The wrapped function prints this as its first line of work
+FIRST_LINE = "    print(time.time_ns(), flush=True)\n"
+
+
+def script_hello() -> str:
+    return (
+        "import time\n"
+        "import simplecli\n\n\n"
+        "@simplecli.wrap\n"
+        "def main(\n"
+        "    name: str,  # Person to greet\n"
+        "):\n" + FIRST_LINE
+    )
+
+
+def script_options(count: int = 50) -> str:
+    params = "".join(
+        f"    option_{i}: int = {i},  # Option number {i}\n"
+        for i in range(count)
+    )
+    return (
+        "import time\n"
+        "import simplecli\n\n\n"
+        "@simplecli.wrap\n"
+        f"def main(\n    name: str,  # Person to greet\n{params}):\n"
+        + FIRST_LINE
+    )
+
+
+def script_long_body(lines: int = 1000) -> str:
+    body = "".join(f"    value_{i} = {i}  # line {i}\n" for i in range(lines))
+    return script_hello() + body
+
+
+SCRIPTS: dict[str, Callable[[], str]] = {
+    "hello": script_hello,
+    "options": script_options,
+    "long_body": script_long_body,
+}
+
+
+def child_env(cache: bool) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")])
+    )
+    # Measure what deployments see, with bytecode and spec caches written
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("SIMPLECLI_NO_CACHE", None)
+    if not cache:
+        env["SIMPLECLI_NO_CACHE"] = "1"
+    return env
+
+
+def measure(path: str, runs: int, cache: bool) -> tuple[list, list]:
+    env = child_env(cache)
+    command = [sys.executable, path, "bench"]
+    # Prime the OS file cache and, when enabled, the spec cache
+    subprocess.run(
+        command,  # noqa: S603
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    first_line, total = [], []
+    for _ in range(runs):
+        start = time.time_ns()
+        result = subprocess.run(
+            command,  # noqa: S603
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        end = time.time_ns()
+        first_line.append((int(result.stdout.split()[0]) - start) / 1e6)
+        total.append((end - start) / 1e6)
+    return first_line, total
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def baseline_interpreter(runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.time_ns()
+        subprocess.run(
+            [sys.executable, "-c", "pass"],  # noqa: S603
+            check=True,
+        )
+        timings.append((time.time_ns() - start) / 1e6)
+    return statistics.median(timings)
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    result = subprocess.run(
+        command,  # noqa: S603
+        env=child_env(True),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return entries
+
+
+def report_import_times(module: str, top: int) -> None:
+    entries = import_times(module)
+    print(f"\n-X importtime for {module} (microseconds)")
+    print(f"  {'self':>8} {'cumulative':>10}  module")
+    for self_us, cumulative_us, name in sorted(entries, reverse=True)[:top]:
+        print(f"  {self_us:>8} {cumulative_us:>10}  {name}")
+    total = next((c for _, c, name in entries if name.strip() == module), None)
+    if total is not None:
+        print(f"  {module} cumulative: {total / 1000:.2f}ms")
+
+
+@simplecli.wrap
+def main(
+    runs: int = 30,  # Timed runs per script
+    top: int = 15,  # Number of imports to list, by self time
+    only: str = "",  # Only run scripts whose name contains this string
+) -> None:
+    """
+    Cold-start benchmark, from `python script.py` to the first line of the
+    wrapped function, with an `-X importtime` breakdown of simplecli.
+    """
+    interpreter = baseline_interpreter(runs)
+    print(f"Interpreter baseline (python -c pass): {interpreter:.2f}ms\n")
+    print(
+        f"{'script':<24} {'first line':>12} {'p95':>9} "
+        f"{'process':>10} {'p95':>9}"
+    )
+    with tempfile.TemporaryDirectory(prefix="simplecli-coldstart-") as tmp:
+        for name, source in SCRIPTS.items():
+            if only and only not in name:
+                continue
+            path = os.path.join(tmp, f"{name}.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source())
+            for cache in (False, True):
+                first_line, total = measure(path, runs, cache)
+                label = f"{name} ({'cached' if cache else 'no cache'})"
+                print(
+                    f"{label:<24} "
+                    f"{statistics.median(first_line):>10.2f}ms "
+                    f"{percentile(first_line, 0.95):>7.2f}ms "
+                    f"{statistics.median(total):>8.2f}ms "
+                    f"{percentile(total, 0.95):>7.2f}ms"
+                )
+    report_import_times(TARGET_MODULE, top)
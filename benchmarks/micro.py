@@ -0,0 +1,215 @@
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+import simplecli
+from simplecli.simplecli import (
+    Param,
+    clean_args,
+    extract_code_params,
+    format_docstring,
+    help_text,
+    params_to_kwargs,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+ROUNDS = 5
+ROUND_SECONDS = 0.05
+Case = Callable[[], object]
+
+_tempdir = tempfile.TemporaryDirectory(prefix="simplecli-bench-")
+
+
+def synthetic_function(count: int) -> Callable[..., object]:
+    lines = ["def code("]
+    for i in range(count):
+        lines.append(f"    param_{i}: int = {i},  # Description of {i}")
+    lines += ["):", "    pass", ""]
+    path = os.path.join(_tempdir.name, f"synthetic_{count}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    spec = importlib.util.spec_from_file_location(f"synthetic_{count}", path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module.code
+
+
+def synthetic_params(count: int) -> list[Param]:
+    return [
+        Param(
+            name=f"param_{i}",
+            annotation=int,
+            default=i,
+            description=f"Description of {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_argv(count: int) -> list[str]:
+    # Mostly positionals, with a sprinkling of keyword arguments
+    return [
+        f"--option-{i}={i}" if i % 100 == 0 else str(i) for i in range(count)
+    ]
+
+
+def case_extract_code_params(count: int) -> Case:
+    code = synthetic_function(count)
+    return lambda: extract_code_params(code)
+
+
+def case_clean_args(count: int) -> Case:
+    argv = synthetic_argv(count)
+    return lambda: clean_args(argv)
+
+
+def case_params_to_kwargs(count: int) -> Case:
+    pos_args = [str(i) for i in range(count)]
+    # The list comes first, a leading bool would take the first positional
+    params = [
+        Param(name="values", annotation=list[int]),
+        Param(name="flag", annotation=bool),
+    ]
+    # A bare `--flag`, as clean_args binds it
+    _, kw_args = clean_args(["--flag"])
+    return lambda: params_to_kwargs(params, pos_args, kw_args)
+
+
+def scale(a: int, tags: list[str], factor: float = 1.0) -> tuple:
+    return a, factor, tags
+
+
+def case_invoke_threads(threads: int) -> Case:
+    # The same calls split across threads, compare sizes to see scaling
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(threads)
+    calls = [[str(i), "--factor=2", "x", "y"] for i in range(2000)]
+    simplecli.invoke(scale, calls[0])
+
+    def call_many(argvs: list[list[str]]) -> None:
+        for argv in argvs:
+            simplecli.invoke(scale, argv)
+
+    return lambda: list(
+        executor.map(call_many, [calls[i::threads] for i in range(threads)])
+    )
+
+
+def case_help_text(count: int) -> Case:
+    params = synthetic_params(count)
+    return lambda: help_text("bench.py", params, "Synthetic benchmark")
+
+
+def case_format_docstring(count: int) -> Case:
+    docstring = "\n" + "    Lorem ipsum dolor sit amet, consectetur.\n" * count
+    return lambda: format_docstring(docstring)
+
+
+SIGNATURE_SIZES = (10, 100, 1000, 5000)
+ARGV_SIZES = (10, 1000, 100_000, 1_000_000)
+DOCSTRING_SIZES = (10, 1000, 100_000)
+THREAD_COUNTS = (1, 4)
+CASES: dict[str, tuple[Callable[[int], Case], tuple[int, ...]]] = {
+    "extract_code_params": (case_extract_code_params, SIGNATURE_SIZES),
+    "clean_args": (case_clean_args, ARGV_SIZES),
+    "params_to_kwargs": (case_params_to_kwargs, ARGV_SIZES),
+    "invoke_threads": (case_invoke_threads, THREAD_COUNTS),
+    "help_text": (case_help_text, SIGNATURE_SIZES),
+    "format_docstring": (case_format_docstring, DOCSTRING_SIZES),
+}
+
+
+def ops_per_sec(case: Case) -> float:
+    start = time.perf_counter()
+    case()
+    elapsed = time.perf_counter() - start
+    number = max(1, int(ROUND_SECONDS / max(elapsed, 1e-9)))
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(number):
+            case()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def peak_memory(case: Case) -> int:
+    tracemalloc.start()
+    try:
+        case()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick: bool, only: str) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, (factory, sizes) in CASES.items():
+        if only and only not in name:
+            continue
+        for size in sizes[:2] if quick else sizes:
+            case = factory(size)
+            key = f"{name}[{size}]"
+            results[key] = {
+                "ops_per_sec": ops_per_sec(case),
+                "peak_bytes": peak_memory(case),
+            }
+            print(
+                f"{key:<36} {results[key]['ops_per_sec']:>14,.1f} ops/s "
+                f"{results[key]['peak_bytes'] / 1024:>12,.1f} KiB",
+                flush=True,
+            )
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    failures = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]["ops_per_sec"]
+        if result["ops_per_sec"] < expected * (1 - tolerance):
+            failures.append(
+                f"  {key}: {result['ops_per_sec']:,.1f} ops/s "
+                f"(baseline {expected:,.1f} ops/s)"
+            )
+    return failures
+
+
+@simplecli.wrap
+def main(
+    save: bool = False,  # Save these results as this machine's baseline
+    quick: bool = False,  # Only run the two smallest sizes of each case
+    only: str = "",  # Only run cases whose name contains this string
+    tolerance: float = 0.25,  # Allowed ops/sec drop versus the baseline
+    baseline: str = BASELINE,  # Baseline JSON file, never committed
+) -> None:
+    """
+    Micro-benchmarks for extraction, argv parsing and help rendering.
+    Reports ops/sec and peak memory, and compares against a baseline saved
+    on this machine with --save.
+    """
+    results = run(quick, only)
+    if save:
+        with open(baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline saved to {baseline}")
+        return
+    if not os.path.isfile(baseline):
+        print(f"No baseline at {baseline}, run with --save to create one")
+        return
+    with open(baseline, encoding="utf-8") as f:
+        failures = regressions(results, json.load(f), tolerance)
+    if failures:
+        sys.exit("\n".join(["Performance regressions:", *failures]))
+    print("No regressions versus baseline")
@@ -1,5 +1,115 @@
-from simplecli.simplecli import wrap
+from __future__ import annotations
+import sys
+
+# Avoids importing `typing` (and the parser) when only decorating
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable
+    from simplecli.arraytypes import FloatArray, IntArray
+    from simplecli.filetypes import (
+        BinaryInputFile,
+        BinaryOutputFile,
+        InputFile,
+        LazyFile,
+        MappedFile,
+        OutputFile,
+    )
 
 __all__ = [
+    "ArgumentError",
+    "BinaryInputFile",
+    "BinaryOutputFile",
+    "FloatArray",
+    "HelpRequested",
+    "InputFile",
+    "IntArray",
+    "LazyFile",
+    "MappedFile",
+    "MissingTypeHint",
+    "OutputFile",
+    "UnsupportedType",
+    "UsageError",
+    "VersionRequested",
+    "command",
+    "dispatch",
+    "invoke",
     "wrap",
 ]
+# Defined with the parser, which is only imported when they are used
+_ERRORS = (
+    "ArgumentError",
+    "HelpRequested",
+    "MissingTypeHint",
+    "UnsupportedType",
+    "UsageError",
+    "VersionRequested",
+)
+# Annotations, imported from their module on first use
+_TYPES = {
+    "BinaryInputFile": "filetypes",
+    "BinaryOutputFile": "filetypes",
+    "FloatArray": "arraytypes",
+    "InputFile": "filetypes",
+    "IntArray": "arraytypes",
+    "LazyFile": "filetypes",
+    "MappedFile": "filetypes",
+    "OutputFile": "filetypes",
+}
+
+# Set by `python -m simplecli` tools to record decorated functions, as
+# (command name, function) pairs with an empty name for `@wrap`
+_collected: list[tuple[str, Callable[..., Any]]] | None = None
+
+
+def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+    # Imported functions are returned untouched, without loading the parser
+    if func.__globals__["__name__"] != "__main__":
+        if _collected is not None:
+            _collected.append(("", func))
+        return func
+    from simplecli.simplecli import wrap as simplecli_wrap
+
+    return simplecli_wrap(func)
+
+
+def command(func: Callable[..., Any]) -> Callable[..., Any]:
+    if func.__globals__["__name__"] != "__main__":
+        if _collected is not None:
+            _collected.append((func.__name__.replace("_", "-"), func))
+        return func
+    from simplecli.simplecli import command as simplecli_command
+
+    return simplecli_command(func)
+
+
+def dispatch() -> Any:  # noqa: ANN401
+    # Nothing was registered unless the parser was loaded by `command`, and
+    # scripts imported by `python -m simplecli` tools are never run
+    if _collected is not None or "simplecli.simplecli" not in sys.modules:
+        return None
+    from simplecli.simplecli import dispatch as simplecli_dispatch
+
+    return simplecli_dispatch()
+
+
+def invoke(
+    func: Callable[..., Any],
+    argv: Iterable[str] = (),
+    prog: str = "",
+) -> Any:  # noqa: ANN401
+    from simplecli.simplecli import invoke as simplecli_invoke
+
+    return simplecli_invoke(func, argv, prog)
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name in _ERRORS:
+        from simplecli import simplecli
+
+        return getattr(simplecli, name)
+    if name in _TYPES:
+        from importlib import import_module
+
+        module = import_module(f"simplecli.{_TYPES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
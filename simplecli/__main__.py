@@ -0,0 +1,31 @@
+import simplecli
+
+
+@simplecli.command
+def compile(
+    script: str,  # Wrapped script to compile
+    output: str = "",  # Defaults to <script>_simplecli.py next to the script
+) -> None:
+    """
+    Precompile parameters and help text, so startup needs no source
+    """
+    from simplecli.compiler import compile_script
+
+    print(f"Wrote {compile_script(script, output)}")
+
+
+@simplecli.command
+def completion(
+    script: str,  # Wrapped script to complete
+    shell: str = "bash",  # One of bash, zsh or fish
+    prog: str = "",  # Command name to complete, defaults to the script name
+) -> None:
+    """
+    Print a static shell completion script, which never starts Python
+    """
+    from simplecli.completion import completion_script
+
+    print(completion_script(script, shell, prog))
+
+
+simplecli.dispatch()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from array import array
+from itertools import islice
+
+# Imported by scripts annotated with an array type, also when they start from
+# a cached spec, so `typing` is avoided at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable
+
+
+# Values converted per C loop, a chunk is kept to report a bad value
+CHUNK_SIZE = 4096
+
+
+class ArrayValueError(ValueError):
+    def __init__(self, index: int, value: str) -> None:
+        super().__init__(index, value)
+        # Position and text of the first value that could not be stored
+        self.index = index
+        self.value = value
+
+
+class NumericArray(array):
+    """
+    Annotation for any number of numbers, packed into an `array.array`
+    instead of a list with one Python object per value
+    """
+
+    # `typecode` itself is read from instances, set by `array`
+    item_code = "q"
+    item_type: type = int
+
+    def __new__(cls, values: Iterable[str] = ()) -> NumericArray:
+        items = super().__new__(cls, cls.item_code)  # type: ignore[call-arg]
+        values = iter(values)
+        # Converted and packed in C loops, values that fit are kept
+        while chunk := list(islice(values, CHUNK_SIZE)):
+            start = len(items)
+            try:
+                items.extend(map(cls.item_type, chunk))
+            except (OverflowError, ValueError):
+                index = len(items)
+                raise ArrayValueError(index, chunk[index - start]) from None
+        return items
+
+    def __reduce_ex__(self, protocol: object) -> tuple[object, ...]:
+        # `array` may pickle subclasses by calling them with a typecode
+        return restore_array, (type(self), self.tobytes())
+
+
+def restore_array(cls: type[NumericArray], data: bytes) -> NumericArray:
+    items = cls()
+    items.frombytes(data)
+    return items
+
+
+class IntArray(NumericArray):
+    """
+    Annotation for any number of ints, the wrapped function receives an
+    `array.array` of 64-bit signed ints
+    """
+
+    item_code = "q"
+    item_type = int
+
+
+class FloatArray(NumericArray):
+    """
+    Annotation for any number of floats, the wrapped function receives an
+    `array.array` of doubles
+    """
+
+    item_code = "d"
+    item_type = float
+
+
+def is_array_type(annotation: object) -> bool:
+    return isinstance(annotation, type) and issubclass(
+        annotation, NumericArray
+    )
@@ -0,0 +1,448 @@
+from __future__ import annotations
+import inspect
+import os
+import shlex
+import sys
+from collections.abc import Generator, Iterable, Iterator
+from functools import partial
+from itertools import islice
+from simplecli.filetypes import MappedFile
+from simplecli.output import (
+    broken_pipe_exit,
+    flush_interval,
+    line_formatter,
+    open_buffered_stdout,
+    positive_int_option,
+    write_records,
+)
+from simplecli.simplecli import (
+    ArgumentError,
+    DefaultIfBool,
+    LazyValues,
+    Param,
+    clean_args,
+    close_arguments,
+    params_to_kwargs,
+)
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:
+    import asyncio
+    from simplecli.simplecli import ArgDict, ArgList, ValueType
+
+DEFAULT_CHUNKSIZE = 16
+DEFAULT_CONCURRENCY = 64
+OPTIONS = (
+    "simplecli_batch",
+    "simplecli_chunksize",
+    "simplecli_concurrency",
+    "simplecli_flush",
+    "simplecli_jobs",
+    "simplecli_unordered",
+)
+# (label, error, result) for each call, an empty error means success
+Outcome = tuple[str, str, Any]
+# (label, arguments), a batch line to split or an already split argument
+Line = tuple[str, Union[str, list[str]]]
+
+
+class Records(list):
+    # A generator's records, collected in a worker process
+    pass
+
+
+class LazyList(list):
+    # An `Iterator` parameter's values, converted before being sent to a
+    # worker process, which cannot receive the iterator itself
+    pass
+
+
+def call_error(error: BaseException) -> str:
+    if isinstance(error, SystemExit):
+        # Mirror the interpreter, `sys.exit()` and `sys.exit(0)` succeed
+        return "" if error.code in (None, 0) else str(error.code)
+    return f"{type(error).__name__}: {error}"
+
+
+def bind_line(
+    params: list[Param],
+    line: Union[str, ArgList],
+    common: ArgDict,
+) -> ArgDict:
+    if isinstance(line, str):
+        pos_args, kw_args = clean_args(shlex.split(line))
+    else:
+        # Map mode arguments were parsed once already, and are never options
+        pos_args, kw_args = line, {}
+    try:
+        return params_to_kwargs(params, pos_args, {**common, **kw_args})
+    except TypeError as e:
+        sys.exit("\n".join(e.args))
+
+
+def batch_lines(source: ValueType) -> Generator[Line, None, None]:
+    # A bare `--simplecli-batch` or `--simplecli-batch=-` reads stdin
+    if source in (DefaultIfBool, "-"):
+        yield from numbered_lines(sys.stdin)
+        return
+    with open(str(source), encoding="utf-8") as lines:
+        yield from numbered_lines(lines)
+
+
+def numbered_lines(lines: Iterable[str]) -> Iterator[Line]:
+    for lineno, line in enumerate(lines, 1):
+        if line.strip():
+            yield f"line {lineno}", line
+
+
+def argument_lines(pos_args: Iterable[str]) -> Iterator[Line]:
+    # Each positional argument becomes a call of its own
+    for index, value in enumerate(pos_args, 1):
+        yield f"argument {index}", [value]
+
+
+def call_serial(
+    func: Callable[..., Any],
+    params: list[Param],
+    lines: Iterable[Line],
+    common: ArgDict,
+    write: Callable[[Iterator[Any]], None],
+) -> Iterator[Outcome]:
+    for label, line in lines:
+        kwargs: ArgDict = {}
+        try:
+            kwargs = bind_line(params, line, common)
+            result = func(**kwargs)
+            if isinstance(result, Iterator):
+                # Records are written while the call's files are open
+                write(result)
+                result = None
+        except BrokenPipeError:
+            raise
+        except (Exception, SystemExit) as e:
+            yield label, call_error(e), None
+            continue
+        finally:
+            close_arguments(kwargs.values())
+        yield label, "", result
+
+
+async def call_async(
+    func: Callable[..., Any],
+    kwargs: ArgDict,
+) -> tuple[str, Any]:
+    try:
+        return "", await func(**kwargs)
+    except (Exception, SystemExit) as e:
+        return call_error(e), None
+    finally:
+        # Both the single loop and worker processes come through here
+        close_arguments(kwargs.values())
+
+
+async def call_chunk_async(
+    func: Callable[..., Any],
+    chunk: list[ArgDict],
+    concurrency: int,
+) -> list[tuple[str, Any]]:
+    import asyncio
+
+    # As `call_concurrent`, at most `concurrency` calls are in flight
+    limit = asyncio.Semaphore(concurrency)
+
+    async def call(kwargs: ArgDict) -> tuple[str, Any]:
+        async with limit:
+            return await call_async(func, kwargs)
+
+    calls = (
+        call({name: local_value(v) for name, v in kwargs.items()})
+        for kwargs in chunk
+    )
+    return list(await asyncio.gather(*calls))
+
+
+def finish_next_task(
+    loop: asyncio.AbstractEventLoop,
+    window: list,
+    ordered: bool,
+) -> Outcome:
+    import asyncio
+
+    index = 0
+    if not ordered:
+        done, _ = loop.run_until_complete(
+            asyncio.wait(
+                [task for _, task in window],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        )
+        index = next(i for i, (_, task) in enumerate(window) if task in done)
+    label, task = window.pop(index)
+    error, result = loop.run_until_complete(task)
+    return label, error, result
+
+
+def call_concurrent(
+    func: Callable[..., Any],
+    params: list[Param],
+    lines: Iterable[Line],
+    common: ArgDict,
+    concurrency: int,
+    ordered: bool,
+) -> Iterator[Outcome]:
+    import asyncio
+
+    # All calls share one event loop, with at most `concurrency` in flight
+    loop = asyncio.new_event_loop()
+    window: list = []
+    try:
+        for label, line in lines:
+            try:
+                kwargs = bind_line(params, line, common)
+            except (Exception, SystemExit) as e:
+                yield label, call_error(e), None
+                continue
+            task = loop.create_task(call_async(func, kwargs))
+            window.append((label, task))
+            if len(window) >= concurrency:
+                yield finish_next_task(loop, window, ordered)
+        while window:
+            yield finish_next_task(loop, window, ordered)
+    finally:
+        # Only left over when the consumer stopped early
+        tasks = [task for _, task in window]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+        loop.close()
+
+
+def local_value(value: Any) -> Any:  # noqa: ANN401
+    # `LazyList` values go back to the iterator they were sent as
+    return iter(value) if isinstance(value, LazyList) else value
+
+
+def call_chunk(
+    func: Callable[..., Any],
+    chunk: list[ArgDict],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[tuple[str, Any]]:
+    # Runs in worker processes, errors are sent back as strings
+    if inspect.iscoroutinefunction(func):
+        import asyncio
+
+        return asyncio.run(call_chunk_async(func, chunk, concurrency))
+    results: list[tuple[str, Any]] = []
+    for kwargs in chunk:
+        kwargs = {name: local_value(v) for name, v in kwargs.items()}
+        try:
+            result = func(**kwargs)
+            if isinstance(result, Iterator):
+                # Generators cannot be sent back, their records can
+                result = Records(result)
+            results.append(("", result))
+        except (Exception, SystemExit) as e:
+            results.append((call_error(e), None))
+        finally:
+            close_arguments(kwargs.values())
+    return results
+
+
+def close_chunk(chunk: list[ArgDict], _future: object = None) -> None:
+    # Also a future's done callback, through `partial`
+    for kwargs in chunk:
+        close_arguments(kwargs.values())
+
+
+def check_remote(params: list[Param]) -> None:
+    # Memory maps belong to the process that made them, and cannot be sent
+    for param in params:
+        if MappedFile in param.spec.datatypes:
+            sys.exit(
+                f"Error, '{param.help_name}' is a MappedFile, which cannot "
+                "be used with '--simplecli-jobs'"
+            )
+
+
+def bind_remote(
+    params: list[Param],
+    line: Union[str, ArgList],
+    common: ArgDict,
+) -> ArgDict:
+    kwargs = bind_line(params, line, common)
+    try:
+        for name, value in list(kwargs.items()):
+            if isinstance(value, LazyValues):
+                kwargs[name] = LazyList(value)
+    except ArgumentError as e:
+        # Reported like any other binding error of the line
+        close_arguments(kwargs.values())
+        sys.exit(str(e))
+    return kwargs
+
+
+def finish_next(window: list, ordered: bool) -> Iterator[Outcome]:
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    index = 0
+    if not ordered:
+        done, _ = wait([f for _, f in window], return_when=FIRST_COMPLETED)
+        index = next(i for i, (_, f) in enumerate(window) if f in done)
+    labels, future = window.pop(index)
+    try:
+        results = future.result()
+    except Exception as e:  # Pickling errors, worker crashes, etc...
+        results = [(call_error(e), None)] * len(labels)
+    for label, (error, result) in zip(labels, results):
+        yield label, error, result
+
+
+def call_pooled(
+    func: Callable[..., Any],
+    params: list[Param],
+    lines: Iterable[Line],
+    common: ArgDict,
+    jobs: int,
+    chunksize: int,
+    concurrency: int,
+    ordered: bool,
+) -> Iterator[Outcome]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Bind in this process with the already extracted params, call remotely
+    lines = iter(lines)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        window: list = []
+        while chunk := list(islice(lines, chunksize)):
+            labels, bound = [], []
+            for label, line in chunk:
+                try:
+                    bound.append(bind_remote(params, line, common))
+                    labels.append(label)
+                except (Exception, SystemExit) as e:
+                    yield label, call_error(e), None
+            if bound:
+                future = executor.submit(call_chunk, func, bound, concurrency)
+                # The worker has its own copies once the chunk is done
+                future.add_done_callback(partial(close_chunk, bound))
+                window.append((labels, future))
+            # Keep a bounded number of chunks in flight
+            while len(window) > jobs * 2:
+                yield from finish_next(window, ordered)
+        while window:
+            yield from finish_next(window, ordered)
+
+
+def expose_for_pickling(func: Callable[..., Any]) -> None:
+    # `wrap` runs before the module binds the function's name, which
+    # `pickle` needs to send it to worker processes
+    if "." not in func.__qualname__:
+        func.__globals__[func.__qualname__] = func
+
+
+def outcomes(
+    func: Callable[..., Any],
+    params: list[Param],
+    pos_args: Iterable[str],
+    kw_args: ArgDict,
+    options: ArgDict,
+    write: Callable[[Iterator[Any]], None],
+) -> Iterator[Outcome]:
+    for key in options:
+        if key not in OPTIONS:
+            sys.exit(f"Error: Unexpected argument '{key}'")
+    batch = options.pop("simplecli_batch", None)
+    is_async = inspect.iscoroutinefunction(func)
+    jobs = 0
+    if "simplecli_jobs" in options:
+        cpus = os.cpu_count() or 1
+        jobs = positive_int_option(options, "simplecli_jobs", cpus)
+    elif batch is None and not is_async:
+        sys.exit("Error, '--simplecli-batch' or '--simplecli-jobs' required")
+    chunksize = positive_int_option(
+        options, "simplecli_chunksize", DEFAULT_CHUNKSIZE
+    )
+    concurrency = positive_int_option(
+        options, "simplecli_concurrency", DEFAULT_CONCURRENCY
+    )
+    ordered = options.pop("simplecli_unordered", None) is None
+
+    if batch is None:
+        lines: Iterable[Line] = argument_lines(pos_args)
+    elif next(iter(pos_args), None) is not None:
+        # Positionals may be a stream, such as `--simplecli-args0` input
+        sys.exit("Error, batch arguments must be passed via batch input")
+    else:
+        lines = batch_lines(batch)
+    if not jobs and is_async:
+        return call_concurrent(
+            func, params, lines, kw_args, concurrency, ordered
+        )
+    if not jobs:
+        return call_serial(func, params, lines, kw_args, write)
+    check_remote(params)
+    expose_for_pickling(func)
+    return call_pooled(
+        func, params, lines, kw_args, jobs, chunksize, concurrency, ordered
+    )
+
+
+def write_outcomes(
+    results: Iterable[Outcome],
+    write: Callable[[Iterable[Any]], None],
+    format_line: Callable[[Any], str],
+    every: int,
+) -> tuple[int, int]:
+    # Returns the failed and total call counts
+    failed = total = written = 0
+    for label, error, result in results:
+        total += 1
+        if error:
+            failed += 1
+            print(f"Error, {label}: {error}", file=sys.stderr)
+        elif isinstance(result, Records):
+            write(result)
+        elif result is not None:
+            sys.stdout.write(format_line(result))
+            written += 1
+            if every and written % every == 0:
+                sys.stdout.flush()
+    return failed, total
+
+
+def run_many(
+    func: Callable[..., Any],
+    params: list[Param],
+    pos_args: Iterable[str],
+    kw_args: ArgDict,
+    options: ArgDict,
+) -> None:
+    noun = "batch lines" if "simplecli_batch" in options else "arguments"
+    format_line = line_formatter(options)
+    every = flush_interval(options)
+    failed = total = 0
+    stdout = sys.stdout
+    sys.stdout = open_buffered_stdout()
+
+    def write(records: Iterable[Any]) -> None:
+        write_records(sys.stdout, records, format_line, every)
+
+    try:
+        failed, total = write_outcomes(
+            outcomes(func, params, pos_args, kw_args, options, write),
+            write,
+            format_line,
+            every,
+        )
+    except BrokenPipeError:
+        broken_pipe_exit()
+    except OSError as e:
+        sys.exit(f"Error, unable to read batch input: {e}")
+    finally:
+        sys.stdout.flush()
+        sys.stdout = stdout
+    if failed:
+        sys.exit(f"Error, {failed} of {total} {noun} failed")
@@ -0,0 +1,111 @@
+# Thin client for scripts served with `--simplecli-serve`, it forwards the
+# arguments, working directory, environment and standard streams, then
+# exits with the call's exit code. Only cheap modules are imported here.
+from __future__ import annotations
+import binascii
+import errno
+import marshal
+import os
+import socket
+import stat
+import sys
+
+SOCKET_ENV = "SIMPLECLI_SOCKET"
+# Request size prefix, the request itself is marshalled
+SIZE_BYTES = 8
+
+
+def check_private(directory: str) -> None:
+    # Owned by this user and closed to everyone else, not a symlink
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise PermissionError(
+            errno.EPERM, "Not a private directory", directory
+        )
+
+
+def socket_directory(create: bool = False) -> str:
+    # In a shared `/tmp`, other users could take a socket's name first
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    directory = (
+        os.path.join(runtime, "simplecli")
+        if runtime
+        else f"/tmp/simplecli-{os.getuid()}"  # noqa: S108
+    )
+    if create:
+        # Without `contextlib.suppress`, which the client does not import
+        try:  # noqa: SIM105
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+    check_private(directory)
+    return directory
+
+
+def default_socket_path(script: str, create: bool = False) -> str:
+    # Per script, even when names collide
+    path = os.path.abspath(script)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    checksum = binascii.crc32(os.fsencode(path))
+    return os.path.join(
+        socket_directory(create), f"{stem}-{checksum:08x}.sock"
+    )
+
+
+def peer_uid(sock: socket.socket) -> int | None:
+    # The user on the other end of a connected Unix socket, if the
+    # platform can tell
+    if hasattr(socket, "SO_PEERCRED"):
+        # Linux `struct ucred`, pid, uid and gid
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, 12)
+        return int.from_bytes(creds[4:8], sys.byteorder)
+    if hasattr(socket, "LOCAL_PEERCRED"):
+        # BSD and macOS `struct xucred`, version then uid
+        creds = sock.getsockopt(0, socket.LOCAL_PEERCRED, 76)
+        return int.from_bytes(creds[4:8], sys.byteorder)
+    return None
+
+
+def send_request(sock: socket.socket, argv: list) -> None:
+    request = marshal.dumps(
+        {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    )
+    data = len(request).to_bytes(SIZE_BYTES, "big") + request
+    # Standard streams travel with the first chunk, as file descriptors
+    sent = socket.send_fds(sock, [data], [0, 1, 2])
+    sock.sendall(data[sent:])
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(f"Usage: {sys.argv[0]} SCRIPT [ARGS...]")
+    script, argv = sys.argv[1], sys.argv[2:]
+    path = os.environ.get(SOCKET_ENV, "")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            path = path or default_socket_path(script)
+            sock.connect(path)
+            uid = peer_uid(sock)
+        except OSError:
+            uid = None
+        if uid is None:
+            # No server, or one that cannot be verified, run the script
+            args = [sys.executable, script, *argv]
+            os.execv(sys.executable, args)  # noqa: S606
+        if uid != os.getuid():
+            # Never send the environment and streams to another user
+            sys.exit(f"Error, '{path}' is served by uid {uid}")
+        send_request(sock, argv)
+        try:
+            status = sock.recv(1)
+        except KeyboardInterrupt:
+            sys.exit(130)
+    sys.exit(status[0] if status else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import importlib.util
+import os
+import pprint
+import sys
+import simplecli
+from simplecli.simplecli import (
+    COMPILED_SUFFIX,
+    COMPILED_VERSION,
+    FILENAME_MARKER,
+    MissingTypeHint,
+    UnsupportedType,
+    cache_key,
+    extract_code_params,
+    format_docstring,
+    help_text,
+    internal_params,
+    param_to_spec,
+)
+from types import ModuleType
+from typing import Any, Callable
+
+HEADER = """\
+# Generated by `python -m simplecli compile {script}`, do not edit.
+# Regenerate whenever the wrapped functions' parameters or comments change.
+"""
+
+
+def default_output(script: str) -> str:
+    stem = os.path.splitext(os.path.basename(script))[0]
+    return os.path.join(os.path.dirname(script), f"{stem}{COMPILED_SUFFIX}.py")
+
+
+def import_script(
+    script: str,
+) -> tuple[ModuleType, list[tuple[str, Callable[..., Any]]]]:
+    # Imported under another name, `wrap` and `command` only collect
+    stem = os.path.splitext(os.path.basename(script))[0]
+    spec = importlib.util.spec_from_file_location(f"{stem}_compiling", script)
+    if spec is None or spec.loader is None:
+        sys.exit(f"Error, unable to import '{script}'")
+    module = importlib.util.module_from_spec(spec)
+    collected: list[tuple[str, Callable[..., Any]]] = []
+    simplecli._collected = collected
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+        simplecli._collected = None
+    return module, collected
+
+
+def compile_function(func: Callable[..., Any]) -> dict[str, Any]:
+    try:
+        params = extract_code_params(func)
+    except UnsupportedType as e:
+        sys.exit(f"Error, '{func.__name__}' UnsupportedType: {e.args[1]}")
+    except MissingTypeHint as e:
+        sys.exit(f"Error, '{func.__name__}' {e}")
+    docstring = format_docstring(func.__doc__ or "")
+    internal = internal_params(func, FILENAME_MARKER)
+    return {
+        "params": [param_to_spec(param) for param in params],
+        "docstring": docstring,
+        "help": help_text(FILENAME_MARKER, params + internal, docstring),
+    }
+
+
+def compile_script(script: str, output: str = "") -> str:
+    _, collected = import_script(script)
+    if not collected:
+        sys.exit(f"Error, no `@wrap` or `@command` functions in '{script}'")
+    functions = {
+        cache_key(func): compile_function(func) for _, func in collected
+    }
+    output = output or default_output(script)
+    # Checked when loading, a module renamed for another script is ignored
+    stem = os.path.splitext(os.path.basename(script))[0]
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(HEADER.format(script=os.path.basename(script)))
+        f.write(f"VERSION = {COMPILED_VERSION}\n")
+        f.write(f"SCRIPT = {stem!r}\n")
+        f.write(f"FUNCTIONS = {pprint.pformat(functions, width=79)}\n")
+    return output
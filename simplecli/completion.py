@@ -0,0 +1,228 @@
+from __future__ import annotations
+import os
+import re
+import sys
+from simplecli.compiler import import_script
+from simplecli.simplecli import (
+    Param,
+    MissingTypeHint,
+    UnsupportedType,
+    extract_code_params,
+    first_line,
+    internal_params,
+)
+
+SHELLS = ("bash", "zsh", "fish")
+
+# Value hints, from the annotation
+FLAG = "flag"
+NUMBER = "number"
+FILE = "file"
+
+
+def value_hint(param: Param) -> str:
+    if param.internal_only or param.spec.is_bool:
+        return FLAG
+    if param.spec.is_array or all(
+        t in (int, float, type(None)) for t in param.datatypes
+    ):
+        return NUMBER
+    return FILE
+
+
+def function_name(prog: str) -> str:
+    return "_simplecli_" + re.sub(r"\W", "_", prog)
+
+
+def sh_quote(text: str) -> str:
+    # Single quotes work the same way in bash and zsh
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+def fish_quote(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def option_words(params: list[Param]) -> str:
+    return " ".join(
+        f"--{p.help_name}" + ("" if value_hint(p) == FLAG else "=")
+        for p in params
+    )
+
+
+def bash_script(prog: str, commands: dict[str, list[Param]]) -> str:
+    func = function_name(prog)
+    # `=` is in COMP_WORDBREAKS, so `--name=value` arrives as three words
+    lines = [
+        f"{func}() {{",
+        "    local cur=${COMP_WORDS[COMP_CWORD]}",
+        "    local prev=${COMP_WORDS[COMP_CWORD-1]}",
+        "    local cmd= opt= opts=",
+    ]
+    if "" not in commands:
+        lines += [
+            "    if [[ $COMP_CWORD -eq 1 ]]; then",
+            f"        opts={sh_quote(' '.join(commands))}",
+            '        COMPREPLY=($(compgen -W "$opts --help" -- "$cur"))',
+            "        return",
+            "    fi",
+            "    cmd=${COMP_WORDS[1]}",
+        ]
+    lines += [
+        '    if [[ $cur == "=" ]]; then',
+        "        opt=$prev cur=",
+        '    elif [[ $prev == "=" && $COMP_CWORD -gt 1 ]]; then',
+        "        opt=${COMP_WORDS[COMP_CWORD-2]}",
+        "    fi",
+        '    case "$cmd" in',
+    ]
+    for name, params in commands.items():
+        numbers = [
+            f"--{p.help_name}" for p in params if value_hint(p) == NUMBER
+        ]
+        lines.append(f"        {sh_quote(name)})")
+        lines.append(f"            opts={sh_quote(option_words(params))}")
+        if numbers:
+            lines += [
+                '            case "$opt" in',
+                f"                {'|'.join(numbers)}) return ;;",
+                "            esac",
+            ]
+        lines.append("            ;;")
+    lines += [
+        "    esac",
+        "    if [[ -z $opt && $cur == -* ]]; then",
+        '        COMPREPLY=($(compgen -W "$opts" -- "$cur"))',
+        "        [[ $COMPREPLY == *= ]] && compopt -o nospace",
+        "    else",
+        '        COMPREPLY=($(compgen -f -- "$cur"))',
+        "    fi",
+        "}",
+        f"complete -F {func} {prog}",
+    ]
+    return "\n".join(lines)
+
+
+def zsh_spec(param: Param) -> str:
+    description = re.sub(r"([\\\[\]])", r"\\\1", param.description)
+    hint = value_hint(param)
+    if hint == FLAG:
+        return sh_quote(f"--{param.help_name}[{description}]")
+    action = "_files" if hint == FILE else " "
+    return sh_quote(
+        f"--{param.help_name}=[{description}]:{param.help_type}:{action}"
+    )
+
+
+def zsh_arguments(params: list[Param], indent: str) -> list[str]:
+    specs = [zsh_spec(p) for p in params] + [sh_quote("*:argument:_files")]
+    return (
+        [f"{indent}_arguments -S \\"]
+        + [f"{indent}    {spec} \\" for spec in specs[:-1]]
+        + [f"{indent}    {specs[-1]}"]
+    )
+
+
+def zsh_script(
+    prog: str,
+    commands: dict[str, list[Param]],
+    descriptions: dict[str, str],
+) -> str:
+    func = function_name(prog)
+    lines = [f"#compdef {prog}", "", f"{func}() {{"]
+    if "" in commands:
+        lines += zsh_arguments(commands[""], "    ")
+    else:
+        lines.append("    local -a commands=(")
+        for name in commands:
+            lines.append(f"        {sh_quote(f'{name}:{descriptions[name]}')}")
+        lines += [
+            "    )",
+            "    if (( CURRENT == 2 )); then",
+            "        _describe command commands",
+            "        return",
+            "    fi",
+            "    local cmd=$words[2]",
+            "    shift words",
+            "    (( CURRENT-- ))",
+            '    case "$cmd" in',
+        ]
+        for name, params in commands.items():
+            lines.append(f"        {sh_quote(name)})")
+            lines += zsh_arguments(params, "            ")
+            lines.append("            ;;")
+        lines.append("    esac")
+    # Works both autoloaded from `fpath` and sourced from `.zshrc`
+    lines += [
+        "}",
+        "",
+        "if [[ $zsh_eval_context[-1] == loadautofunc ]]; then",
+        f'    {func} "$@"',
+        "else",
+        f"    compdef {func} {prog}",
+        "fi",
+    ]
+    return "\n".join(lines)
+
+
+def fish_option(prog: str, param: Param, condition: str) -> str:
+    line = f"complete -c {prog}"
+    if condition:
+        line += f" -n {fish_quote(condition)}"
+    line += f" -l {param.help_name}"
+    hint = value_hint(param)
+    if hint == NUMBER:
+        # Exclusive, a value is required and files are not offered
+        line += " -x"
+    elif hint == FILE:
+        line += " -r"
+    if param.description:
+        line += f" -d {fish_quote(param.description)}"
+    return line
+
+
+def fish_script(
+    prog: str,
+    commands: dict[str, list[Param]],
+    descriptions: dict[str, str],
+) -> str:
+    if "" in commands:
+        return "\n".join(fish_option(prog, p, "") for p in commands[""])
+    lines = []
+    for name in commands:
+        lines.append(
+            f"complete -c {prog} -f -n __fish_use_subcommand "
+            f"-a {fish_quote(name)} -d {fish_quote(descriptions[name])}"
+        )
+    for name, params in commands.items():
+        condition = f"__fish_seen_subcommand_from {name}"
+        lines += [fish_option(prog, p, condition) for p in params]
+    return "\n".join(lines)
+
+
+def completion_script(script: str, shell: str, prog: str = "") -> str:
+    if shell not in SHELLS:
+        sys.exit(
+            f"Error, unsupported shell '{shell}', "
+            f"use one of: {', '.join(SHELLS)}"
+        )
+    prog = prog or os.path.basename(script)
+    _, collected = import_script(script)
+    if not collected:
+        sys.exit(f"Error, no `@wrap` or `@command` functions in '{script}'")
+    commands: dict[str, list[Param]] = {}
+    descriptions: dict[str, str] = {}
+    for name, func in collected:
+        try:
+            params = extract_code_params(func)
+        except UnsupportedType as e:
+            sys.exit(f"Error, '{func.__name__}' UnsupportedType: {e.args[1]}")
+        except MissingTypeHint as e:
+            sys.exit(f"Error, '{func.__name__}' {e}")
+        commands[name] = params + internal_params(func, prog)
+        descriptions[name] = first_line(func.__doc__)
+    if shell == "bash":
+        return bash_script(prog, commands)
+    if shell == "zsh":
+        return zsh_script(prog, commands, descriptions)
+    return fish_script(prog, commands, descriptions)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+import contextlib
+import marshal
+import os
+import signal
+import socket
+import stat
+import sys
+from simplecli import simplecli
+from simplecli.client import SIZE_BYTES, default_socket_path, peer_uid
+from typing import Any, Callable, NoReturn
+
+# Inherited across the re-exec that reloads a changed script
+LISTEN_FD_ENV = "SIMPLECLI_SERVE_FD"
+PENDING_FD_ENV = "SIMPLECLI_SERVE_PENDING_FD"
+# Set in forked children, which never serve themselves
+serving_call = False
+
+
+def socket_path(option: str, filename: str) -> str:
+    # `--simplecli-serve` or `--simplecli-serve=PATH`
+    path = option.partition("=")[2]
+    if path:
+        return path
+    try:
+        return default_socket_path(filename, create=True)
+    except OSError as e:
+        sys.exit(f"Error, unable to use '{e.filename}': {e.strerror}")
+
+
+def remove_stale(path: str) -> None:
+    # Only sockets this user left behind, never someone else's file
+    info = os.lstat(path)
+    if info.st_uid != os.getuid():
+        sys.exit(f"Error, '{path}' belongs to another user")
+    if not stat.S_ISSOCK(info.st_mode):
+        sys.exit(f"Error, '{path}' exists and is not a socket")
+    os.unlink(path)
+
+
+def inherited_socket(env: str) -> socket.socket | None:
+    fileno = os.environ.pop(env, "")
+    return socket.socket(fileno=int(fileno)) if fileno else None
+
+
+def listen(path: str) -> socket.socket:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except FileNotFoundError:
+        pass
+    except ConnectionRefusedError:
+        remove_stale(path)  # Left behind by a server that died
+    else:
+        sys.exit(f"Error, already serving on '{path}'")
+    finally:
+        probe.close()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only the owner may connect, calls run with the owner's permissions
+    umask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(umask)
+    listener.listen(64)
+    return listener
+
+
+def receive_request(
+    conn: socket.socket,
+) -> tuple[dict[str, Any], list[int]] | None:
+    data, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    if not data:
+        return None  # Liveness probe from `listen`
+    size = int.from_bytes(data[:SIZE_BYTES], "big")
+    data = data[SIZE_BYTES:]
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise EOFError("Incomplete request")
+        data += chunk
+    # Only the owner can reach the socket, see `check_private`
+    return marshal.loads(data), fds  # noqa: S302
+
+
+def exit_code(run: Callable[[], Any]) -> int:
+    # Mirrors how the interpreter turns an uncaught exception into a status
+    try:
+        run()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def handle(
+    conn: socket.socket,
+    filename: str,
+    run: Callable[[], Any],
+) -> NoReturn:
+    global serving_call
+    serving_call = True
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 1
+    try:
+        if peer_uid(conn) not in (None, os.getuid()):
+            os._exit(code)
+        received = receive_request(conn)
+        if received is None:
+            os._exit(0)
+        request, fds = received
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = [filename, *request["argv"]]
+        code = exit_code(run)
+    except Exception as e:
+        print(f"Error, unable to handle request: {e}", file=sys.stderr)
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            # The client may be gone already
+            with contextlib.suppress(OSError, ValueError):
+                stream.flush()
+        try:
+            conn.sendall(bytes([code & 0xFF]))
+        finally:
+            os._exit(code & 0xFF)
+
+
+def source_mtime(source: str, previous: int) -> int:
+    # Editors may briefly remove the file while saving, keep serving
+    try:
+        return os.stat(source).st_mtime_ns
+    except OSError:
+        return previous
+
+
+def reload(listener: socket.socket, conn: socket.socket) -> NoReturn:
+    # Start over with the same listening socket, so no call is refused, and
+    # hand the new process the call that noticed the change
+    for sock, env in ((listener, LISTEN_FD_ENV), (conn, PENDING_FD_ENV)):
+        sock.set_inheritable(True)
+        os.environ[env] = str(sock.fileno())
+    argv = getattr(sys, "orig_argv", [sys.executable, *sys.argv])
+    os.execv(sys.executable, [sys.executable, *argv[1:]])  # noqa: S606
+
+
+def serve(
+    option: str,
+    funcs: list[Callable[..., Any]],
+    run: Callable[[], Any],
+) -> NoReturn:
+    if serving_call:
+        sys.exit("Error, '--simplecli-serve' is not allowed in served calls")
+    filename = sys.argv[0]
+    source = funcs[0].__code__.co_filename
+    mtime = os.stat(source).st_mtime_ns
+    # Parameters are parsed once, every forked call starts with them
+    commands = {func: name for name, func in simplecli._commands.items()}
+    for func in funcs:
+        simplecli._preloaded[func] = simplecli.load_params(
+            func, filename, commands.get(func, "")
+        )
+
+    path = socket_path(option, filename)
+    listener = inherited_socket(LISTEN_FD_ENV)
+    pending = inherited_socket(PENDING_FD_ENV)
+    if listener is None:
+        listener = listen(path)
+        print(f"Serving {filename} on {path}", file=sys.stderr)
+    # Finished calls are reaped by the kernel
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # Stopping the server removes its socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            conn = pending or listener.accept()[0]
+            pending = None
+            if source_mtime(source, mtime) != mtime:
+                print(f"Reloading {filename}", file=sys.stderr)
+                reload(listener, conn)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if os.fork() == 0:
+                listener.close()
+                handle(conn, filename, run)
+            conn.close()
+    except KeyboardInterrupt:
+        sys.exit(0)
+    finally:
+        listener.close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
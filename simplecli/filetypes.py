@@ -0,0 +1,193 @@
+from __future__ import annotations
+import errno
+import os
+import sys
+
+# Imported by `simplecli.simplecli`, also when a script starts from a cached
+# spec, so `typing` is avoided at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Any, Iterable, Iterator
+
+
+if TYPE_CHECKING:
+    # Type checkers see the value the wrapped function receives
+    MappedFile = memoryview
+else:
+
+    class MappedFile:
+        """
+        Annotation for a path that is memory-mapped read-only, the wrapped
+        function receives a `memoryview` of the contents
+        """
+
+        def __new__(cls, path: str) -> memoryview:
+            import mmap
+
+            with open(path, "rb") as f:
+                try:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    return memoryview(b"")
+            return memoryview(mapped)
+
+
+class LazyFile:
+    """
+    Opened on first use, so untouched files are never opened or created.
+    `-` is stdin or stdout. Subclass to change the buffer size or encoding
+    """
+
+    mode = "r"
+    buffer_size = 1 << 20
+    encoding: str | None = None
+    newline: str | None = None
+
+    def __init__(self, path: str) -> None:
+        self.name = path
+        self._file: IO[Any] | None = None
+        self._owned = False
+        if path != "-":
+            self.check()
+
+    def check(self) -> None:
+        # Report bad paths while binding arguments, not on first use
+        path = self.name
+        if os.path.isdir(path):
+            raise OSError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+        if "r" in self.mode:
+            if not os.path.exists(path):
+                code = errno.ENOENT
+            elif not os.access(path, os.R_OK):
+                code = errno.EACCES
+            else:
+                return
+        else:
+            directory = os.path.dirname(path) or "."
+            if not os.path.isdir(directory):
+                code = errno.ENOENT
+            elif not os.access(
+                path if os.path.exists(path) else directory, os.W_OK
+            ):
+                code = errno.EACCES
+            else:
+                return
+        raise OSError(code, os.strerror(code), path)
+
+    @property
+    def file(self) -> IO[Any]:
+        if self._file is None:
+            self._file = self.open()
+        return self._file
+
+    def open(self) -> IO[Any]:
+        # The file outlives this call, `close` closes it when owned
+        binary = "b" in self.mode
+        encoding = None if binary else self.encoding
+        newline = None if binary else self.newline
+        self._owned = True
+        if self.name != "-":
+            return open(  # noqa: SIM115
+                self.name,
+                self.mode,
+                self.buffer_size,
+                encoding=encoding,
+                newline=newline,
+            )
+        stream = sys.stdin if "r" in self.mode else sys.stdout
+        try:
+            fileno = stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            # Replaced streams, such as `io.StringIO`, are used as-is
+            self._owned = False
+            if binary:
+                return stream.buffer
+            return stream
+        stream.flush()
+        return open(  # noqa: SIM115
+            fileno,
+            self.mode,
+            self.buffer_size,
+            encoding=encoding,
+            newline=newline,
+            closefd=False,
+        )
+
+    def close(self) -> None:
+        file, self._file = self._file, None
+        if file is None:
+            return
+        if self._owned:
+            file.close()
+        else:
+            file.flush()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.file, name)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.file)
+
+    def __enter__(self) -> LazyFile:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class InputFile(LazyFile):
+    mode = "r"
+
+
+class OutputFile(LazyFile):
+    mode = "w"
+
+
+class BinaryInputFile(LazyFile):
+    mode = "rb"
+
+
+class BinaryOutputFile(LazyFile):
+    mode = "wb"
+
+
+FILE_TYPES = (LazyFile, MappedFile)
+
+
+def is_file_type(annotation: object) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, FILE_TYPES)
+
+
+def release_mapped(view: memoryview) -> None:
+    # Nothing can have been mapped unless `mmap` was imported
+    mmap = sys.modules.get("mmap")
+    if mmap is None:
+        return
+    try:
+        mapped = view.obj
+        view.release()
+    except ValueError:  # Already released
+        return
+    except BufferError:  # Still exported, left to the GC
+        return
+    if isinstance(mapped, mmap.mmap):
+        try:
+            mapped.close()
+        except BufferError:
+            return
+
+
+def close_files(values: Iterable[Any]) -> None:
+    for value in values:
+        items = value if isinstance(value, (list, set)) else (value,)
+        for item in items:
+            if isinstance(item, LazyFile):
+                item.close()
+            elif isinstance(item, memoryview):
+                release_mapped(item)
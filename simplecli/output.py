@@ -0,0 +1,170 @@
+from __future__ import annotations
+import contextlib
+import io
+import os
+import sys
+from collections.abc import AsyncIterator, Generator, Iterable, Iterator
+from simplecli.simplecli import DefaultIfBool
+from typing import TYPE_CHECKING, Any, Callable, NoReturn, TextIO
+
+if TYPE_CHECKING:
+    from simplecli.simplecli import ArgDict
+
+STDOUT_BUFFER_SIZE = 1 << 16
+OPTIONS = ("simplecli_flush", "simplecli_output")
+# Turns one record into one line of output, including the newline
+LineFormatter = Callable[[Any], str]
+TSV_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+
+def open_buffered_stdout(buffer_size: int = STDOUT_BUFFER_SIZE) -> TextIO:
+    # Large writes straight to the stdout file descriptor, if there is one
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout
+    sys.stdout.flush()
+    # Owned by the returned wrapper, so not opened in a `with` block
+    raw = open(  # noqa: SIM115
+        fileno, "wb", buffering=buffer_size, closefd=False
+    )
+    return io.TextIOWrapper(
+        raw,
+        encoding=sys.stdout.encoding,
+        errors=sys.stdout.errors,
+    )
+
+
+def positive_int_option(options: ArgDict, name: str, default: int) -> int:
+    value = options.pop(name, default)
+    if value is DefaultIfBool:
+        return default
+    try:
+        number = int(value)  # type: ignore[arg-type]
+    except ValueError:
+        number = 0
+    if number < 1:
+        sys.exit(f"Error, '--{name.replace('_', '-')}' must be a positive int")
+    return number
+
+
+def broken_pipe_exit() -> NoReturn:
+    # The reader went away (`| head`), silence the final flush at shutdown
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    with contextlib.suppress(AttributeError, OSError, ValueError):
+        os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+
+def flush_interval(options: ArgDict) -> int:
+    # Records between flushes, 0 flushes only when the buffer is full
+    if "simplecli_flush" in options:
+        return positive_int_option(options, "simplecli_flush", 1)
+    isatty = getattr(sys.stdout, "isatty", None)
+    return 1 if isatty and isatty() else 0
+
+
+def raw_line(record: Any) -> str:  # noqa: ANN401
+    return f"{record}\n"
+
+
+def tsv_line(record: Any) -> str:  # noqa: ANN401
+    # Sequences and mappings are one row, anything else is a single field
+    if isinstance(record, dict):
+        record = record.values()
+    elif isinstance(record, (str, bytes)) or not isinstance(record, Iterable):
+        record = (record,)
+    fields = (
+        "" if field is None else str(field).translate(TSV_ESCAPES)
+        for field in record
+    )
+    return "\t".join(fields) + "\n"
+
+
+def jsonl_formatter() -> LineFormatter:
+    import json
+
+    # One encoder for every record, unknown types fall back to `str`
+    encode = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode
+    return lambda record: f"{encode(record)}\n"
+
+
+FORMATTERS: dict[str, Callable[[], LineFormatter]] = {
+    "jsonl": jsonl_formatter,
+    "raw": lambda: raw_line,
+    "tsv": lambda: tsv_line,
+}
+
+
+def line_formatter(options: ArgDict) -> LineFormatter:
+    name = options.pop("simplecli_output", "raw")
+    if name not in FORMATTERS:
+        sys.exit(
+            "Error, '--simplecli-output' must be one of: "
+            + ", ".join(FORMATTERS)
+        )
+    return FORMATTERS[str(name)]()
+
+
+def write_records(
+    out: TextIO,
+    records: Iterable[Any],
+    format_line: LineFormatter,
+    every: int,
+) -> None:
+    # One write per record keeps order with `print` calls in the generator
+    write = out.write
+    if not every:
+        for record in records:
+            write(format_line(record))
+        return
+    for count, record in enumerate(records, 1):
+        write(format_line(record))
+        if count % every == 0:
+            out.flush()
+
+
+async def write_async_records(
+    out: TextIO,
+    records: AsyncIterator[Any],
+    format_line: LineFormatter,
+    every: int,
+) -> None:
+    count = 0
+    async for record in records:
+        out.write(format_line(record))
+        count += 1
+        if every and count % every == 0:
+            out.flush()
+
+
+def stream_output(records: Any, options: ArgDict) -> None:  # noqa: ANN401
+    for key in options:
+        if key not in OPTIONS:
+            sys.exit(f"Error: Unexpected argument '{key}'")
+    format_line = line_formatter(options)
+    every = flush_interval(options)
+    if not isinstance(records, (Iterator, AsyncIterator)):
+        # A plain return value is a single record, `None` is no output
+        records = iter(() if records is None else (records,))
+    stdout = sys.stdout
+    sys.stdout = out = open_buffered_stdout()
+    try:
+        if isinstance(records, Iterator):
+            write_records(out, records, format_line, every)
+        else:
+            import asyncio
+
+            asyncio.run(write_async_records(out, records, format_line, every))
+        out.flush()
+    except BrokenPipeError:
+        broken_pipe_exit()
+    finally:
+        sys.stdout = stdout
+        if isinstance(records, Generator):
+            # Run the generator's cleanup even when it was not exhausted
+            records.close()
@@ -1,37 +1,43 @@
 from __future__ import annotations
-import ast
-import contextlib
-import inspect
 import io
+import marshal
 import os
 import re
 import sys
-import textwrap
 from collections import OrderedDict
-from collections.abc import Generator
-from tokenize import (
-    COMMENT,
-    NAME,
-    NL,
-    TokenError,
-    TokenInfo,
-    generate_tokens,
+from collections.abc import Generator, Iterable, Iterator
+from itertools import chain
+from types import (
+    AsyncGeneratorType,
+    CoroutineType,
+    FunctionType,
+    GenericAlias,
 )
-from typing import (
-    Any,
-    Callable,
-    Union,
-    get_args,
-    get_origin,
-)
-from types import GenericAlias
+from simplecli.filetypes import close_files, is_file_type
 
 try:
     from types import UnionType
 except ImportError:  # pragma: no cover - coverage is generated via py3.12
-    # Adapted from cpython/Lib/types.py which defines it as `int | str`.
-    # This is ok because if UnionType is not imported, it is not supported.
-    UnionType = Union[int, str]  # type: ignore
+    # `int | str` is not supported before py3.10, so nothing has this type,
+    # and `typing.Union` still maps to it through `get_origin`.
+    # A stand-in keeps `typing` from being imported at startup.
+    class UnionType:  # type: ignore[no-redef]
+        pass
+
+
+# `inspect`, `tokenize` and `typing` are only imported to parse a signature,
+# scripts started from a cached spec never need them
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import weakref
+    from tokenize import TokenInfo
+    from typing import (
+        IO,
+        Any,
+        Callable,
+        NoReturn,
+        Union,
+    )
 
 
 # 2023 - Clif Bratcher WIP
@@ -45,41 +51,335 @@ class DefaultIfBool:
     pass
 
 
+if TYPE_CHECKING:
+    ValueType = Union[type[DefaultIfBool], type[Empty], bool, float, int, str]
+    ArgDict = dict[str, ValueType]
+    ArgList = list[str]
+
+
 class UnsupportedType(TypeError):
     pass
 
 
+class MissingTypeHint(TypeError):
+    pass
+
+
+class UsageError(Exception):
+    # Raised by `invoke` where the command line prints a message and exits
+    def __str__(self) -> str:
+        return "\n".join(map(str, self.args))
+
+
+class ArgumentError(UsageError, TypeError):
+    def __init__(
+        self,
+        *lines: str,
+        kind: str = "invalid",
+        params: Iterable[str] = (),
+        index: Union[int, None] = None,
+    ) -> None:
+        super().__init__(*lines)
+        # One of "missing", "too_many", "unexpected" or "invalid"
+        self.kind = kind
+        self.params = list(params)
+        # Position of the bad value, for lazily converted `Iterator` items
+        self.index = index
+
+
+class HelpRequested(UsageError):
+    pass
+
+
+class VersionRequested(UsageError):
+    pass
+
+
 _wrapped = False
-ValueType = Union[type[DefaultIfBool], type[Empty], bool, float, int, str]
-ArgDict = dict[str, ValueType]
-ArgList = list[str]
-valid_origins = (Union, UnionType, list, set)
+_commands: dict[str, Callable[..., Any]] = {}
+_preloaded: dict[Callable[..., Any], tuple[list[Param], str]] = {}
+# Params are never written to while binding, so `invoke` loads them once,
+# created on first use
+_invoked: Union[
+    weakref.WeakKeyDictionary[Callable[..., Any], tuple[list[Param], str]],
+    None,
+] = None
+CACHE_VERSION = 1
+CACHE_DISABLE_ENV = "SIMPLECLI_NO_CACHE"
+COMPILED_VERSION = 2
+COMPILED_SUFFIX = "_simplecli"
+# Stands in for `sys.argv[0]` in compiled help text
+FILENAME_MARKER = "\x00filename\x00"
+# Annotations bound without a converter of their own
+value_types = (bool, float, int, str)
+# Lazy origins are converted while the wrapped function iterates
+lazy_origins = (Iterator, Iterable)
+# `typing.Union` is reported as `UnionType` by `get_origin`
+valid_origins = (UnionType, list, set, *lazy_origins)
+KEYWORD_ARG = re.compile(r"--([\w-]+)(?:=(.+))?")
+
+
+def get_origin(annotation: object) -> object:
+    # As `typing.get_origin`, annotations from `typing` mean it is loaded
+    if type(annotation) is GenericAlias:
+        return annotation.__origin__
+    if type(annotation) is UnionType:
+        return UnionType
+    typing = sys.modules.get("typing")
+    if typing is None:
+        return None
+    origin = typing.get_origin(annotation)
+    return UnionType if origin is typing.Union else origin
+
+
+def get_args(annotation: object) -> tuple[Any, ...]:
+    if type(annotation) in (GenericAlias, UnionType):
+        return annotation.__args__  # type: ignore[attr-defined]
+    typing = sys.modules.get("typing")
+    return typing.get_args(annotation) if typing else ()
+
+
+def is_array_type(annotation: object) -> bool:
+    # Array annotations import their module, until then nothing is one
+    arraytypes = sys.modules.get("simplecli.arraytypes")
+    return arraytypes is not None and arraytypes.is_array_type(annotation)
+
+
+class ParamInfo:
+    # Immutable, precomputed view of a Param for the parse path
+    __slots__ = (
+        "name",
+        "annotation",
+        "default",
+        "datatypes",
+        "origin",
+        "is_seq",
+        "is_lazy",
+        "is_array",
+        "is_bool",
+        "is_file",
+        "internal_only",
+        "optional",
+        "required",
+        "help_name",
+        "help_type",
+        "convert",
+    )
+    name: str
+    annotation: Any
+    default: object
+    datatypes: tuple[Any, ...]
+    origin: Any
+    is_seq: bool
+    is_lazy: bool
+    is_array: bool
+    is_bool: bool
+    is_file: bool
+    internal_only: bool
+    optional: bool
+    required: bool
+    help_name: str
+    help_type: str
+    convert: Callable[[Any], Any]
+
+    def __init__(
+        self,
+        name: str,
+        annotation: Any,  # noqa: ANN401
+        default: object = Empty,
+        internal_only: bool = False,
+        optional: Union[bool, None] = None,
+        required: bool = True,
+    ) -> None:
+        args = get_args(annotation)
+        datatypes = tuple(args) if args else (annotation,)
+        origin = get_origin(annotation)
+        if optional is None:
+            optional = len(datatypes) == 2 and type(None) in datatypes
+        is_bool = bool in datatypes
+        if origin in valid_origins:
+            help_type = f"[{', '.join(a.__name__ for a in datatypes)}]"
+        else:
+            help_type = annotation.__name__
+        setattr_ = super().__setattr__
+        setattr_("name", name)
+        setattr_("annotation", annotation)
+        setattr_("default", default)
+        setattr_("datatypes", datatypes)
+        setattr_("origin", origin)
+        is_array = is_array_type(annotation)
+        setattr_("is_seq", is_array or origin in (list, set, *lazy_origins))
+        setattr_("is_lazy", origin in lazy_origins)
+        setattr_("is_array", is_array)
+        setattr_("is_bool", is_bool)
+        setattr_("is_file", any(map(is_file_type, datatypes)))
+        setattr_("internal_only", internal_only)
+        setattr_("optional", optional)
+        # Internal only, optional, defaulted and bool never require a value
+        setattr_(
+            "required",
+            required
+            and not (internal_only or optional or is_bool)
+            and default is Empty,
+        )
+        setattr_("help_name", name.replace("_", "-"))
+        setattr_("help_type", help_type)
+        setattr_("convert", compile_converter(annotation))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"ParamInfo is frozen, cannot set '{name}'")
+
+    # Parsing returns values instead of storing them, so one spec can be
+    # bound by many threads at once
 
+    def unset_value(self) -> ValueType:
+        if self.default is not Empty:
+            return self.default  # type: ignore[return-value]
+        if self.is_bool:
+            return False
+        return Empty
+
+    def parse(self, value: ValueType) -> Any:  # noqa: ANN401
+        if self.is_seq:
+            return self.parse_seq([value])  # type: ignore[list-item]
+        if value is DefaultIfBool:
+            if not self.is_bool:
+                raise ValueError(f"'{self.help_name}' requires a value")
+            return True if self.default is Empty else not self.default
+        try:
+            return self.convert(value)
+        except ValueError:
+            raise self.type_error() from None
+        except OSError as e:
+            raise self.open_error(e) from None
+
+    def parse_seq(self, values: Iterable[str]) -> Any:  # noqa: ANN401
+        if self.is_lazy:
+            return self.iter_values(values)
+        if self.is_array:
+            from simplecli.arraytypes import ArrayValueError
 
-class Param(inspect.Parameter):
+            try:
+                return self.annotation(values)
+            except ArrayValueError as e:
+                raise self.item_error(e, e.index, e.value) from None
+        try:
+            return self.origin(map(self.convert, values))
+        except ValueError:
+            raise self.type_error() from None
+        except OSError as e:
+            raise self.open_error(e) from None
+
+    def iter_values(self, values: Iterable[str]) -> LazyValues:
+        # Nothing is read or converted until the wrapped function iterates,
+        # binding errors surface there, with the position of the bad value
+        return LazyValues(self, values)
+
+    def item_error(
+        self,
+        error: Union[OSError, ValueError],
+        index: int,
+        value: Union[str, None] = None,
+    ) -> ArgumentError:
+        message = (
+            self.open_error(error)
+            if isinstance(error, OSError)
+            else self.type_error()
+        ).args[0]
+        message += f", index {index}"
+        if value is not None:
+            message += f" is {value!r}"
+        return ArgumentError(message, params=[self.help_name], index=index)
+
+    def type_error(self) -> ValueError:
+        return ValueError(
+            f"'{self.help_name}' must be of type {self.help_type}"
+        )
+
+    def open_error(self, error: OSError) -> ValueError:
+        return ValueError(
+            f"'{self.help_name}' cannot open '{error.filename}': "
+            f"{error.strerror}"
+        )
+
+    def __repr__(self) -> str:
+        return f"<ParamInfo {self.name}: {self.help_type}>"
+
+
+class LazyValues:
+    # The values of an `Iterator` or `Iterable` parameter, converted as
+    # they are consumed. Files are kept so they are closed with the others
+    # once the call is done.
+    __slots__ = ("spec", "values", "index", "opened")
+
+    def __init__(self, spec: ParamInfo, values: Iterable[str]) -> None:
+        self.spec = spec
+        self.values = iter(values)
+        self.index = 0
+        self.opened: list[Any] = []
+
+    def __iter__(self) -> LazyValues:
+        return self
+
+    def __next__(self) -> Any:  # noqa: ANN401
+        value = next(self.values)
+        index = self.index
+        self.index += 1
+        try:
+            item = self.spec.convert(value)
+        except (OSError, ValueError) as e:
+            raise self.spec.item_error(e, index, value) from None
+        if self.spec.is_file:
+            self.opened.append(item)
+        return item
+
+    def close(self) -> None:
+        close_files(self.opened)
+        self.opened.clear()
+        # Argument file streams are released as well
+        close = getattr(self.values, "close", None)
+        if close is not None:
+            close()
+
+
+def close_arguments(values: Iterable[Any]) -> None:
+    # Files opened while binding, and those opened by lazy parameters
+    values = list(values)
+    for value in values:
+        if isinstance(value, LazyValues):
+            value.close()
+    close_files(values)
+
+
+class Param:
+    # The parts of `inspect.Parameter` used here, without importing it
+    name: str
+    default: Any
+    annotation: Any
     internal_only: bool  # Do not pass to wrapped function
     _required: bool  # Exit if a value is not present
     _optional: Union[bool, None] = None  # Mirrors `Optional` type
 
     def __init__(self, *argv: Any, **kwargs: Any) -> None:
-        kwargs["annotation"] = kwargs.pop("annotation", Empty)
-        kwargs["default"] = kwargs.pop("default", Empty)
-        kwargs["kind"] = kwargs.pop(
-            "kind", inspect.Parameter.POSITIONAL_OR_KEYWORD
-        )
         # Allow 'name' as a positional parameter
         if "name" not in kwargs:
             if len(argv) == 0:
                 raise TypeError("needs 'name' argument")
             kwargs["name"] = argv[0]
             argv = ()
+        if argv:
+            raise TypeError("Param takes 'name' as its only positional")
+        self.name = kwargs.pop("name")
+        self.annotation = kwargs.pop("annotation", Empty)
+        self.default = kwargs.pop("default", Empty)
         param_description = str(kwargs.pop("description", ""))
         param_line = str(kwargs.pop("line", ""))
         param_value = kwargs.pop("value", Empty)
         param_internal_only = bool(kwargs.pop("internal_only", False))
         param_optional = kwargs.pop("optional", None)
         param_required = bool(kwargs.pop("required", True))
-        super().__init__(*argv, **kwargs)
+        if kwargs:
+            raise TypeError(f"unexpected argument '{next(iter(kwargs))}'")
         self._value = param_value
         self.description = param_description
         self.internal_only = param_internal_only
@@ -88,12 +388,22 @@ class Param(inspect.Parameter):
         )
         self._required = param_required
         # Overrides required as these values are generally unused
-        if not self.description:
+        if not self.description and param_line:
             self.parse_or_prepend(param_line)
-        self.validate_annotation(kwargs["name"], kwargs["annotation"])
+        self.validate_annotation(self.name, self.annotation)
+        self.spec = ParamInfo(
+            name=self.name,
+            annotation=self.annotation,
+            default=self.default,
+            internal_only=self.internal_only,
+            optional=self._optional,
+            required=self._required,
+        )
 
     def validate_annotation(self, name: str, annotation: object) -> None:
-        if annotation in get_args(ValueType):
+        if annotation in value_types or is_file_type(annotation):
+            return
+        if is_array_type(annotation):
             return
         if get_origin(annotation) in valid_origins:
             return
@@ -122,6 +432,9 @@ class Param(inspect.Parameter):
             and self.value == other.value
         )
 
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} "{self}">'
+
     def __str__(self) -> str:
         default = "Empty" if self.default is Empty else f"'{self.default}'"
         value = "Empty" if self.value is Empty else f"'{self.value}'"
@@ -137,50 +450,25 @@ class Param(inspect.Parameter):
 
     @property
     def required(self) -> bool:
-        # Internal only params never requires a value
-        if self.internal_only:
-            return False
-
-        # Optional implies no required value
-        if self.optional:
-            return False
-
-        # Existence of a default value implies no required value
-        if self.default is not Empty:
-            return False
-
-        if bool in self.datatypes:
-            return False
-
-        # Fallback to set/default value
-        return self._required
+        return self.spec.required
 
     @property
     def optional(self) -> bool:
-        if self._optional is not None:
-            return self._optional
-        return len(self.datatypes) == 2 and type(None) in self.datatypes
+        return self.spec.optional
 
     @property
     def help_name(self) -> str:
-        return self.name.replace("_", "-")
+        return self.spec.help_name
 
     @property
     def help_type(self) -> str:
-        if get_origin(self.annotation) in valid_origins:
-            typelist = ", ".join([a.__name__ for a in self.datatypes])
-            return f"[{typelist}]"
-        return self.annotation.__name__
+        return self.spec.help_type
 
     @property
     def value(self) -> ValueType:
         if self._value is not Empty:
             return self._value
-        if self.default is not Empty:
-            return self.default
-        if bool in self.datatypes:
-            return False
-        return Empty
+        return self.spec.unset_value()
 
     def _set_description(self, line: str, force: bool = False) -> None:
         if self.description and not force:
@@ -193,6 +481,8 @@ class Param(inspect.Parameter):
         comment: Union[None, str] = None,
         overwrite: bool = True,
     ) -> bool:
+        from tokenize import COMMENT, TokenError
+
         # Necessary for < py3.12
         if not overwrite and self.description:
             return False
@@ -211,64 +501,61 @@ class Param(inspect.Parameter):
 
     @property
     def datatypes(self) -> list[type]:
-        args = get_args(self.annotation)
-        if args:
-            return list(args)
-        return [self.annotation]
+        return list(self.spec.datatypes)
+
+    def clear_value(self) -> None:
+        self._value = Empty
 
     def validate(self, value: ValueType) -> bool:
         # Recurse for list handling
         if isinstance(value, list):
             return all(self.validate(v) for v in value)
-        passed = False
-        for expected_type in self.datatypes:
-            if expected_type is type(None):
-                continue
-            try:
-                expected_type(value)
-                return True
-            except ValueError:
-                pass
-        return passed
+        try:
+            self.spec.convert(value)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def type_error(self) -> ValueError:
+        return self.spec.type_error()
+
+    def open_error(self, error: OSError) -> ValueError:
+        return self.spec.open_error(error)
 
     def set_value(self, value: ValueType) -> None:
-        result = value
-        if self.validate(value) is False:
-            raise ValueError(
-                f"'{self.help_name}' must be of type {self.help_type}"
-            )
-        # Handle datatypes
-        args = get_args(self.annotation)
-        origin = get_origin(self.annotation)
-        if origin in (Union, UnionType):
-            for type_arg in args:
-                with (
-                    contextlib.suppress(TypeError),
-                    contextlib.suppress(ValueError),
-                ):
-                    self._value = type_arg(value)
-            return
-        if value is DefaultIfBool:
-            if bool not in self.datatypes:
-                raise ValueError(f"'{self.help_name}' requires a value")
-            result = True if self.default is Empty else not bool(self.default)
-        self._value = self.annotation(result)
-
-    def set_value_as_seq(self, values: ArgList) -> None:
-        args = get_args(self.annotation)
-        origin = get_origin(self.annotation)
-        self._value = []
-        temp_value = []
-        for value in values:
-            if self.validate(value) is False:
-                raise ValueError(
-                    f"'{self.help_name}' must be of type {self.help_type}"
-                )
-            temp_value.append(args[0](value))
-        self._value = origin(temp_value)
+        self._value = self.spec.parse(value)
+
+    def set_value_as_seq(self, values: Iterable[str]) -> None:
+        self._value = self.spec.parse_seq(values)
+
+
+def compile_converter(annotation: object) -> Callable[[Any], Any]:
+    # Validates and converts in one step, for sequences this is per item
+    if is_array_type(annotation):
+        return annotation.item_type  # type: ignore[attr-defined]
+    datatypes = [
+        datatype
+        for datatype in (get_args(annotation) or (annotation,))
+        if datatype is not type(None)
+    ]
+    if len(datatypes) == 1:
+        return datatypes[0]
+
+    def convert(value: ValueType) -> ValueType:
+        # First matching type wins, in annotation order
+        for datatype in datatypes:
+            try:
+                return datatype(value)
+            except (TypeError, ValueError):
+                continue
+        raise ValueError(value)
+
+    return convert
 
 
 def tokenize_string(string: str) -> Generator[TokenInfo, None, None]:
+    from tokenize import generate_tokens
+
     return generate_tokens(io.StringIO(string).readline)
 
 
@@ -301,26 +588,135 @@ def help_text(
     return "\n".join(["Usage:", usage, ""] + help_msg)
 
 
-def clean_args(argv: list[str]) -> tuple[ArgList, ArgDict]:
+def read_arg_file(path: str) -> Generator[str, None, None]:
+    # One argument per line, read as a stream like the file system names
+    # in `sys.argv` (`surrogateescape` keeps undecodable bytes)
+    try:
+        with open(
+            path,
+            encoding=sys.getfilesystemencoding(),
+            errors="surrogateescape",
+        ) as f:
+            for line in f:
+                arg = line.rstrip("\r\n")
+                if arg:
+                    yield arg
+    except OSError as e:
+        sys.exit(f"Error, unable to read argument file '{path}': {e.strerror}")
+
+
+def read_nul_args(
+    stream: IO[Any],
+    chunk_size: int = 1 << 16,
+) -> Generator[str, None, None]:
+    # NUL-delimited arguments, as written by `find -print0`
+    stream = getattr(stream, "buffer", stream)
+    pending = stream.read(0)
+    sep = b"\0" if isinstance(pending, bytes) else "\0"
+    while chunk := stream.read(chunk_size):
+        *args, pending = (pending + chunk).split(sep)
+        for arg in args:
+            yield os.fsdecode(arg)
+    if pending:
+        yield os.fsdecode(pending)
+
+
+def nul_args(source: ValueType) -> Generator[str, None, None]:
+    # A bare `--simplecli-args0` or `--simplecli-args0=-` reads stdin
+    if source in (DefaultIfBool, "-"):
+        yield from read_nul_args(sys.stdin)
+        return
+    try:
+        with open(str(source), "rb") as f:
+            yield from read_nul_args(f)
+    except OSError as e:
+        sys.exit(f"Error, unable to read arguments from '{source}': {e}")
+
+
+def clean_args(
+    argv: Iterable[str],
+    arg_files: bool = True,
+) -> tuple[ArgList, ArgDict]:
     pos_args: ArgList = []
     kw_args: ArgDict = {}
+    match_keyword = KEYWORD_ARG.match
     for arg in argv:
-        double_hyphen = re.match(r"--([\w-]+)(?:=(.+))?", arg)
-        if not double_hyphen:
+        # Cheap prefix checks first, most arguments are plain positionals
+        double_hyphen = match_keyword(arg) if arg[:2] == "--" else None
+        if double_hyphen:
+            name, value = double_hyphen.groups()
+            if value is None:
+                value = DefaultIfBool
+            # Translate hyphens to underscores
+            kw_args[name.replace("-", "_")] = value
+        elif arg[:1] == "@" and len(arg) > 1 and arg_files:
+            if arg[1] == "@":
+                # `@@` escapes a literal leading `@`
+                pos_args.append(arg[1:])
+            elif not is_arg_file(arg[1:]):
+                # Not a file, a value like `@someone` is passed as-is
+                pos_args.append(arg)
+            else:
+                # Response files are not expanded recursively
+                file_pos, file_kw = clean_args(read_arg_file(arg[1:]), False)
+                pos_args += file_pos
+                kw_args.update(file_kw)
+        else:
             pos_args.append(arg)
-            continue
-        value = double_hyphen.groups()[1]
-        if value is None:
-            value = DefaultIfBool
-        # Translate hyphens to underscores
-        kw_args[double_hyphen.groups()[0].replace("-", "_")] = value
     return pos_args, kw_args
 
 
+def is_arg_file(path: str) -> bool:
+    # Anything readable but a directory, so pipes such as `@/dev/stdin`
+    # or `@<(find ...)` are expanded as well
+    return os.path.exists(path) and not os.path.isdir(path)
+
+
+def arg_file_args(path: str, options: bool) -> Generator[str, None, None]:
+    # Either the options or the positionals of an argument file, each pass
+    # reads the file again
+    match_keyword = KEYWORD_ARG.match
+    for arg in read_arg_file(path):
+        if (arg[:2] == "--" and match_keyword(arg) is not None) is options:
+            yield arg
+
+
+def stream_args(argv: ArgList) -> tuple[Iterable[str], ArgDict]:
+    # As `clean_args`, but positionals of regular argument files are read
+    # when consumed, so large files are never held in memory. Pipes can
+    # only be read once, `clean_args` expands those up front
+    segments: list[Iterable[str]] = []
+    kw_args: ArgDict = {}
+    start = 0
+    for index, arg in enumerate(argv):
+        path = arg[1:]
+        if arg[:1] != "@" or path[:1] in ("", "@") or not os.path.isfile(path):
+            continue
+        pos_args, argv_kw_args = clean_args(argv[start:index])
+        kw_args.update(argv_kw_args)
+        kw_args.update(clean_args(arg_file_args(path, True), False)[1])
+        segments += [pos_args, arg_file_args(path, False)]
+        start = index + 1
+    if not segments:
+        return clean_args(argv)
+    pos_args, argv_kw_args = clean_args(argv[start:])
+    kw_args.update(argv_kw_args)
+    segments.append(pos_args)
+    return chain.from_iterable(segments), kw_args
+
+
+def param_index(params: list[Param]) -> dict[str, Param]:
+    return {param.name: param for param in params}
+
+
+def unexpected_args(params: list[Param], kw_args: ArgDict) -> list[str]:
+    index = param_index(params)
+    return [key for key in kw_args if key not in index]
+
+
 def check_for_unexpected_args(params: list[Param], kw_args: ArgDict) -> None:
-    for key in kw_args:
-        if key not in [a.name for a in params]:
-            exit(f"Error: Unexpected argument '{key}'")
+    for key in unexpected_args(params, kw_args):
+        sys.exit(f"Error: Unexpected argument '{key}'")
 
 
 def missing_params_msg(missing_params: list[Param]) -> list[str]:
@@ -337,39 +733,91 @@ def missing_params_msg(missing_params: list[Param]) -> list[str]:
     return mp_text
 
 
-def params_to_kwargs(
+def bind_value(
+    spec: ParamInfo,
+    args: Iterator[str],
+    kw_value: Union[ValueType, None],
+) -> ValueType:
+    # Returns `Empty` when no value was given, see `ParamInfo.unset_value`
+    try:
+        if spec.is_seq:
+            # Consume ALL pos_args if list or set, lazily for `Iterator`
+            # and `Iterable`, which keep the rest
+            return spec.parse_seq(args)
+        # Positional arguments take precedence
+        if (arg := next(args, Empty)) is not Empty:
+            return spec.parse(arg)
+        if kw_value:
+            return spec.parse(kw_value)
+        if spec.is_file and isinstance(spec.default, str):
+            # Path defaults, such as "-", are opened like arguments
+            return spec.parse(spec.default)
+    except ValueError as e:
+        raise ArgumentError(e.args[0], params=[spec.help_name]) from None
+    return spec.unset_value()
+
+
+def bind_params(
     params: list[Param],
-    pos_args: ArgList,
+    pos_args: Iterable[str],
     kw_args: ArgDict,
 ) -> ArgDict:
+    # Params are only read, bound values live in the returned dict, so
+    # concurrent calls can share params without locks
+    kwargs: ArgDict = {}
     missing_params = []
+    # A single pass over pos_args, which may be a stream such as
+    # `--simplecli-args0` input, and avoids quadratic `pop(0)`
+    args = iter(pos_args)
     try:
         for param in params:
-            kw_value = kw_args.get(param.name)
-            if get_origin(param.annotation) in (list, set):
-                # Consume ALL pos_args if list or set
-                param.set_value_as_seq(pos_args)
-                pos_args.clear()
-            # Positional arguments take precedence
-            elif pos_args:
-                param.set_value(pos_args.pop(0))
-            elif kw_value:
-                param.set_value(kw_value)
-                continue
-            elif param.required:
+            spec = param.spec
+            value = bind_value(spec, args, kw_args.get(spec.name))
+            if spec.is_seq:
+                # Whatever is left belongs to the sequence
+                args = iter(())
+            elif value is Empty and spec.required:
                 missing_params.append(param)
-    except ValueError as e:
-        exit(e.args[0])
+            kwargs[spec.name] = value
+
+        if next(args, Empty) is not Empty:
+            raise ArgumentError(
+                "Too many positional arguments!", kind="too_many"
+            )
 
-    if pos_args:
-        raise TypeError("Too many positional arguments!")
+        if missing_params:
+            raise ArgumentError(
+                *missing_params_msg(missing_params),
+                kind="missing",
+                params=[param.help_name for param in missing_params],
+            )
+
+        unexpected = unexpected_args(params, kw_args)
+        if unexpected:
+            raise ArgumentError(
+                f"Error: Unexpected argument '{unexpected[0]}'",
+                kind="unexpected",
+                params=unexpected,
+            )
+    except BaseException:
+        # Nothing is returned, so files opened so far are closed here
+        close_arguments(kwargs.values())
+        raise
+    return kwargs
 
-    if missing_params:
-        raise TypeError(*missing_params_msg(missing_params))
 
-    # If any value from kw_args is not in params, exit with prejiduce!
-    check_for_unexpected_args(params, kw_args)
-    return {param.name: param.value for param in params}
+def params_to_kwargs(
+    params: list[Param],
+    pos_args: Iterable[str],
+    kw_args: ArgDict,
+) -> ArgDict:
+    try:
+        return bind_params(params, pos_args, kw_args)
+    except ArgumentError as e:
+        # Missing and surplus arguments have always been a `TypeError`
+        if e.kind in ("missing", "too_many"):
+            raise
+        sys.exit(str(e))
 
 
 def format_docstring(docstring: str) -> str:
@@ -403,32 +851,135 @@ def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
     if func.__globals__["__name__"] != "__main__":
         return func
     global _wrapped
+    if _wrapped or _commands:
+        sys.exit("Error, sorry only ONE `@wrap` decorator allowed!")
+    _wrapped = True
+    if serve_requested(sys.argv):
+        from simplecli.daemon import serve
+
+        serve(
+            sys.argv[1],
+            [func],
+            lambda: run_wrapped(func, sys.argv[0], sys.argv[1:]),
+        )
+    return run_wrapped(func, sys.argv[0], sys.argv[1:])
+
+
+def serve_requested(argv: ArgList) -> bool:
+    # Only checked as the first argument, to keep the common path cheap
+    return len(argv) > 1 and (
+        argv[1] == "--simplecli-serve"
+        or argv[1].startswith("--simplecli-serve=")
+    )
+
+
+def command(func: Callable[..., Any]) -> Callable[..., Any]:
+    # Registration only, parameters are extracted for the invoked command
+    if func.__globals__["__name__"] != "__main__":
+        return func
     if _wrapped:
-        exit("Error, sorry only ONE `@wrap` decorator allowed!")
+        sys.exit("Error, `@wrap` and `@command` cannot be combined!")
+    _commands[func.__name__.replace("_", "-")] = func
+    return func
+
+
+def first_line(docstring: Union[str, None]) -> str:
+    for line in (docstring or "").splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def commands_help_text(
+    filename: str,
+    commands: dict[str, Callable[..., Any]],
+    docstring: str = "",
+) -> str:
+    help_msg = []
+    if docstring:
+        help_msg += ["Description:", docstring, ""]
+    help_msg.append("Commands:")
+    max_name_len = max(len(name) for name in commands)
+    for name, func in commands.items():
+        help_line = f"  {name}" + " " * (max_name_len - len(name) + 2)
+        help_msg.append(f"{help_line} {first_line(func.__doc__)}".rstrip())
+    usage = f"  {filename} <command> [options]"
+    more = f"Run `{filename} <command> --help` for command options"
+    return "\n".join(["Usage:", usage, ""] + help_msg + ["", more])
+
+
+def dispatch() -> Any:  # noqa: ANN401
+    if not _commands:
+        return None
+    global _wrapped
     _wrapped = True
+    if serve_requested(sys.argv):
+        from simplecli.daemon import serve
+
+        serve(sys.argv[1], list(_commands.values()), dispatch_argv)
+    return dispatch_argv()
+
+
+def dispatch_argv() -> Any:  # noqa: ANN401
     filename = sys.argv[0]
-    argv = sys.argv[1:]
+    name = sys.argv[1] if len(sys.argv) > 1 else "--help"
+    module_globals = next(iter(_commands.values())).__globals__
+    version = module_globals.get("__version__", "")
+    if name == "--version" and version:
+        sys.exit(f"{filename} version {version}")
+    if name not in _commands:
+        message = commands_help_text(
+            filename,
+            _commands,
+            format_docstring(module_globals.get("__doc__") or ""),
+        )
+        if name != "--help":
+            message = f"Error: Unknown command '{name}'\n\n{message}"
+        sys.exit(message)
+    return run_wrapped(_commands[name], filename, sys.argv[2:], name)
+
+
+def unsupported_type_exit(
+    func: Callable[..., Any],
+    filename: str,
+    error: UnsupportedType,
+    command: str = "",
+) -> NoReturn:
+    import inspect
+
+    # Like a traceback, the script and then the command it happened in
+    location = f"File \x22{filename}\x22, line {{}}"
+    if command:
+        location += f", in {command}"
     try:
-        params = extract_code_params(code=func)
-    except UnsupportedType as e:
         source = inspect.findsource(func)
-        offset = source[1] + 1
-        offset += [
-            index
-            for index, line in enumerate(source[0][source[1] :])
-            if re.search(rf"[\(\s]{e.args[0]}:", line)
-        ][0]
-        exit(
-            f"File \x22{filename}\x22, line {offset}\n"
-            f"{source[0][offset - 1].rstrip()}\n"
-            f"UnsupportedType: {e.args[1]}"
+    except OSError:
+        # Sourceless deployments can only point at the `def` line
+        sys.exit(
+            f"{location.format(func.__code__.co_firstlineno)}\n"
+            f"UnsupportedType: {error.args[1]}"
         )
-    pos_args, kw_args = clean_args(argv)
-    params.append(
-        Param("help", description="Show this message", internal_only=True)
+    offset = source[1] + 1
+    offset += [
+        index
+        for index, line in enumerate(source[0][source[1] :])
+        if re.search(rf"[\(\s]{error.args[0]}:", line)
+    ][0]
+    sys.exit(
+        f"{location.format(offset)}\n"
+        f"{source[0][offset - 1].rstrip()}\n"
+        f"UnsupportedType: {error.args[1]}"
     )
-    version = func.__globals__.get("__version__", "")
-    if version:
+
+
+def internal_params(
+    func: Callable[..., Any],
+    filename: str,
+) -> list[Param]:
+    params = [
+        Param("help", description="Show this message", internal_only=True)
+    ]
+    if func.__globals__.get("__version__", ""):
         params.append(
             Param(
                 "version",
@@ -436,36 +987,251 @@ def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
                 internal_only=True,
             )
         )
+    return params
+
+
+def function_params(
+    func: Callable[..., Any],
+    cache: bool = False,
+) -> tuple[list[Param], str]:
+    # Prefer specs from `python -m simplecli compile`, which need no source
+    compiled = load_compiled_spec(func)
+    if compiled is not None:
+        params = params_from_spec(func, compiled["params"])
+        if params is not None:
+            return params, compiled["help"]
+    # Only scripts cache their spec, modules called through `invoke` are
+    # parsed once per process and their directories are left alone
+    if cache:
+        return load_code_params(code=func), ""
+    return extract_code_params(func), ""
+
+
+def load_params(
+    func: Callable[..., Any],
+    filename: str,
+    command: str = "",
+) -> tuple[list[Param], str]:
+    try:
+        return function_params(func, cache=True)
+    except UnsupportedType as e:
+        unsupported_type_exit(func, filename, e, command)
+    except MissingTypeHint as e:
+        sys.exit(str(e))
+
+
+def wrapped_params(
+    func: Callable[..., Any],
+    filename: str,
+    command: str = "",
+) -> tuple[list[Param], str]:
+    # Resident servers load parameters once, before forking for each call
+    params, compiled_help = _preloaded.get(func) or load_params(
+        func, filename, command
+    )
+    prog = f"{filename} {command}" if command else filename
+    return list(params), compiled_help.replace(FILENAME_MARKER, prog)
+
+
+def run_wrapped(
+    func: Callable[..., Any],
+    filename: str,
+    argv: ArgList,
+    command: str = "",
+) -> Any:  # noqa: ANN401
+    params, compiled_help = wrapped_params(func, filename, command)
+    pos_args, kw_args = stream_args(argv)
+    # Help and version name the command, errors in the script name the file
+    filename = f"{filename} {command}" if command else filename
+    params += internal_params(func, filename)
+    version = func.__globals__.get("__version__", "")
 
     if "help" in kw_args:
-        exit(help_text(filename, params, format_docstring(func.__doc__ or "")))
+        sys.exit(
+            compiled_help
+            or help_text(
+                filename, params, format_docstring(func.__doc__ or "")
+            )
+        )
 
     if "version" in kw_args:
         if version != "":
-            exit(f"{filename} version {version}")
+            sys.exit(f"{filename} version {version}")
 
     # Strip internal-only
     params = [param for param in params if not param.internal_only]
+    options = pop_simplecli_args(kw_args)
+    args: Iterable[str] = pos_args
+    if "simplecli_args0" in options:
+        # Streamed after command line positionals, never parsed as options
+        args = chain(pos_args, nul_args(options.pop("simplecli_args0")))
+    if options.keys() - {"simplecli_flush", "simplecli_output"}:
+        # Batch and map modes are loaded only when asked for
+        from simplecli.batch import run_many
+
+        run_many(func, params, args, kw_args, options)
+        return None
+
+    kwargs = bind_or_exit(params, args, kw_args)
+    try:
+        result = call_function(func, kwargs)
+        if (
+            isinstance(result, (Iterator, AsyncGeneratorType))
+            or "simplecli_output" in options
+        ):
+            # Records are written to stdout, so nothing is left to return
+            from simplecli.output import stream_output
+
+            stream_output(result, options)
+            return None
+        return result
+    except ArgumentError as e:
+        # Raised while iterating lazily converted `Iterator` arguments
+        sys.exit(str(e))
+    finally:
+        # Files opened for parameters are closed once the call is done,
+        # including those a lazy parameter opened while it was iterated
+        close_arguments(kwargs.values())
+
+
+def invoke(
+    func: Callable[..., Any],
+    argv: Iterable[str] = (),
+    prog: str = "",
+) -> Any:  # noqa: ANN401
+    """
+    Call `func` with command line style arguments, in-process.
+
+    Unlike `wrap`, `sys.argv` and `_wrapped` are left alone and nothing
+    exits: `--help` and `--version` raise `HelpRequested` or
+    `VersionRequested`, bad arguments raise `ArgumentError` and bad
+    annotations raise `UnsupportedType` or `MissingTypeHint`.
+    """
+    global _invoked
+    prog = prog or func.__name__
+    if _invoked is None:
+        import weakref
+
+        # Racing threads may each create one, losing only cached params
+        _invoked = weakref.WeakKeyDictionary()
+    loaded = _invoked.get(func)
+    if loaded is None:
+        loaded = _invoked[func] = function_params(func)
+    params, compiled_help = loaded
+    # `@file` expansion is for shells, `argv` is passed as-is
+    pos_args, kw_args = clean_args(argv, arg_files=False)
+    if "help" in kw_args:
+        raise HelpRequested(
+            compiled_help.replace(FILENAME_MARKER, prog)
+            or help_text(
+                prog,
+                params + internal_params(func, prog),
+                format_docstring(func.__doc__ or ""),
+            )
+        )
+    version = func.__globals__.get("__version__", "")
+    if "version" in kw_args and version != "":
+        raise VersionRequested(f"{prog} version {version}")
+
+    kwargs = bind_params(params, pos_args, kw_args)
+    result = None
     try:
-        kwargs = params_to_kwargs(params, pos_args, kw_args)
-    except TypeError as e:
-        exit("\n".join(e.args))
+        result = call_function(func, kwargs)
+    finally:
+        # Lazy results may still read their files, the caller closes them
+        lazy = isinstance(result, (Iterator, AsyncGeneratorType))
+        if not lazy:
+            close_arguments(kwargs.values())
+    return result
+
 
-    return func(**kwargs)
+def pop_simplecli_args(kw_args: ArgDict) -> ArgDict:
+    # `--simplecli-*` arguments configure simplecli, not the wrapped function
+    return {
+        key: kw_args.pop(key)
+        for key in [key for key in kw_args if key.startswith("simplecli_")]
+    }
+
+
+def bind_or_exit(
+    params: list[Param],
+    pos_args: Iterable[str],
+    kw_args: ArgDict,
+) -> ArgDict:
+    try:
+        return bind_params(params, pos_args, kw_args)
+    except ArgumentError as e:
+        sys.exit(str(e))
+
+
+def call_function(
+    func: Callable[..., Any],
+    kwargs: ArgDict,
+) -> Any:  # noqa: ANN401
+    result = func(**kwargs)
+    if isinstance(result, CoroutineType):
+        # `async def` entry points run to completion on a fresh event loop
+        import asyncio
+
+        return asyncio.run(result)
+    return result
+
+
+def signature_parts(
+    code: Callable[..., Any],
+) -> list[tuple[str, object, object]]:
+    # (name, default, annotation) in signature order, plain functions are
+    # read from their code object as `inspect` is slow to import
+    if type(code) is not FunctionType or any(
+        hasattr(code, name) for name in ("__signature__", "__wrapped__")
+    ):
+        import inspect
+
+        empty = inspect.Parameter.empty
+        return [
+            (
+                v.name,
+                Empty if v.default is empty else v.default,
+                Empty if v.annotation is empty else v.annotation,
+            )
+            for v in inspect.signature(code).parameters.values()
+        ]
+    func_code = code.__code__
+    positional = func_code.co_argcount
+    keyword = positional + func_code.co_kwonlyargcount
+    names = list(func_code.co_varnames[:keyword])
+    # Star arguments follow the keyword only names in `co_varnames`
+    if func_code.co_flags & 0x04:  # CO_VARARGS
+        names.insert(positional, func_code.co_varnames[keyword])
+        keyword += 1
+    if func_code.co_flags & 0x08:  # CO_VARKEYWORDS
+        names.append(func_code.co_varnames[keyword])
+    defaults = dict(
+        zip(
+            func_code.co_varnames[:positional][::-1],
+            (code.__defaults__ or ())[::-1],
+        )
+    )
+    defaults.update(code.__kwdefaults__ or {})
+    annotations = code.__annotations__
+    return [
+        (name, defaults.get(name, Empty), annotations.get(name, Empty))
+        for name in names
+    ]
 
 
 def code_to_ordered_params(code: Callable[..., Any]) -> OrderedDict:
-    signature = inspect.signature(code)
     result = OrderedDict()
 
-    for k, v in signature.parameters.items():
-        if v.annotation is inspect._empty:
-            exit("ERROR: All wrapped function parameters need type hints!")
-        result[k] = Param(
-            name=v.name,
-            default=Empty if v.default is inspect._empty else v.default,
-            annotation=v.annotation,
-            kind=v.kind,
+    for name, default, annotation in signature_parts(code):
+        if annotation is Empty:
+            raise MissingTypeHint(
+                "ERROR: All wrapped function parameters need type hints!"
+            )
+        result[name] = Param(
+            name=name,
+            default=default,
+            annotation=annotation,
         )
     return result
 
@@ -485,22 +1251,88 @@ def process_comment(
 
 
 def function_def_end(source: str) -> int:
+    import ast
+    import textwrap
+
     fd = ast.parse(textwrap.dedent(source)).body[0]
     if not hasattr(fd, "args"):
         return -1
     return fd.args.args[-1].end_lineno if fd.args.args else -1
 
 
+def signature_tokens(
+    code: Callable[..., Any],
+) -> tuple[list[TokenInfo], int]:
+    # Tokenize lazily from the `def` line and stop at the end of the
+    # signature so the cost is independent of the function body length
+    import inspect
+    from tokenize import (
+        COLON,
+        ENDMARKER,
+        LBRACE,
+        LPAR,
+        LSQB,
+        NAME,
+        NEWLINE,
+        RBRACE,
+        RPAR,
+        RSQB,
+        generate_tokens,
+    )
+
+    lines, lnum = inspect.findsource(code)
+    remaining = iter(lines[lnum:])
+    tokens: list[TokenInfo] = []
+    depth = colon_row = colon_col = 0
+    for token in generate_tokens(lambda: next(remaining, "")):
+        if not tokens and (token.type, token.string) != (NAME, "def"):
+            continue
+        if colon_row and (
+            token.start[0] > colon_row or token.type in (NEWLINE, ENDMARKER)
+        ):
+            break
+        tokens.append(token)
+        if token.exact_type in (LPAR, LSQB, LBRACE):
+            depth += 1
+        elif token.exact_type in (RPAR, RSQB, RBRACE):
+            depth -= 1
+        elif token.exact_type is COLON and depth == 0 and not colon_row:
+            colon_row, colon_col = token.end
+    if not colon_row:
+        return tokens, -1
+
+    # Parse only the signature, with a stub body, for argument positions
+    def_row = tokens[0].start[0]
+    header = lines[lnum + def_row - 1 : lnum + colon_row]
+    header[-1] = header[-1][:colon_col]
+    header[0] = header[0].lstrip()
+    fd_end = function_def_end("".join(header) + "\n pass\n")
+    return tokens, fd_end if fd_end == -1 else fd_end + def_row - 1
+
+
 def extract_code_params(code: Callable[..., Any]) -> list[Param]:
     ordered_params = code_to_ordered_params(code)
+    try:
+        tokens, fd_end = signature_tokens(code)
+    except OSError:
+        # Frozen, zipapp or bytecode-only: the signature has everything
+        # but the comments, so descriptions are left empty
+        return list(ordered_params.values())
+    return params_from_tokens(tokens, fd_end, ordered_params)
+
+
+def params_from_tokens(
+    tokens: list[TokenInfo],
+    fd_end: int,
+    ordered_params: OrderedDict,
+) -> list[Param]:
+    from tokenize import COMMENT, NAME, NL
+
     hints = {k: v.annotation for k, v in ordered_params.items()}.copy()
     comment = ""
     param = None
     params: list[Param] = []
-    source = inspect.getsource(code)
-    fd_end = function_def_end(source)
-
-    for token in tokenize_string(source):
+    for token in tokens:
         if token.exact_type is COMMENT:
             if fd_end > -1 and token.end[0] > fd_end:
                 break
@@ -528,3 +1360,169 @@ def extract_code_params(code: Callable[..., Any]) -> list[Param]:
     if param:
         params.append(param)
     return params
+
+
+def spec_cache_path(filename: str) -> str:
+    directory, basename = os.path.split(os.path.abspath(filename))
+    return os.path.join(
+        directory,
+        "__pycache__",
+        f"{os.path.splitext(basename)[0]}."
+        f"{sys.implementation.cache_tag}.simplecli",
+    )
+
+
+def source_fingerprint(filename: str) -> dict[str, Any]:
+    stat = os.stat(filename)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def source_hash(filename: str) -> str:
+    import hashlib
+
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def param_to_spec(param: Param) -> dict[str, Any]:
+    return {
+        "name": param.name,
+        "annotation": repr(param.annotation),
+        "default": repr(param.default),
+        "description": param.description,
+        "required": param.required,
+        "optional": param.optional,
+    }
+
+
+def read_spec_cache(filename: str) -> dict[str, Any]:
+    cache_file = spec_cache_path(filename)
+    try:
+        # `marshal`, like `.pyc` files, as it is builtin and fast to load
+        with open(cache_file, "rb") as f:
+            cache = marshal.load(f)  # noqa: S302
+        fingerprint = source_fingerprint(filename)
+    except (OSError, EOFError, TypeError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    if cache.get("path") != os.path.abspath(filename):
+        return {}
+    if all(cache.get(k) == v for k, v in fingerprint.items()):
+        return cache
+    # Touched but possibly unchanged, fall back to comparing contents
+    try:
+        if cache.get("sha256") != source_hash(filename):
+            return {}
+    except OSError:
+        return {}
+    cache.update(fingerprint)
+    write_spec_cache(filename, cache)
+    return cache
+
+
+def write_spec_cache(filename: str, cache: dict[str, Any]) -> None:
+    import contextlib
+
+    if sys.dont_write_bytecode:
+        return
+    cache_file = spec_cache_path(filename)
+    # Unique per writer, threads of one process may write at the same time
+    temp_file = f"{cache_file}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(temp_file, "wb") as f:
+            marshal.dump(cache, f)
+        os.replace(temp_file, cache_file)
+    except (OSError, ValueError):
+        with contextlib.suppress(OSError):
+            os.remove(temp_file)
+
+
+def cache_key(code: Callable[..., Any]) -> str:
+    return f"{code.__qualname__}:{code.__code__.co_firstlineno}"
+
+
+def params_from_spec(
+    code: Callable[..., Any],
+    specs: list[dict[str, Any]],
+) -> Union[list[Param], None]:
+    ordered_params = code_to_ordered_params(code)
+    if [spec.get("name") for spec in specs] != list(ordered_params):
+        return None
+    params = []
+    for spec in specs:
+        param = ordered_params[spec["name"]]
+        param.description = spec.get("description", "")
+        if param_to_spec(param) != spec:
+            return None
+        params.append(param)
+    return params
+
+
+def compiled_module_path(code: Callable[..., Any]) -> str:
+    # Next to the script, `__file__` is the `.pyc` when deployed without
+    # source, without a suffix as either `.py` or `.pyc` is loaded
+    filename = code.__globals__.get("__file__") or code.__code__.co_filename
+    directory, basename = os.path.split(os.path.abspath(filename))
+    stem = os.path.splitext(basename)[0]
+    return os.path.join(directory, f"{stem}{COMPILED_SUFFIX}")
+
+
+def load_compiled_spec(code: Callable[..., Any]) -> Union[dict, None]:
+    base = compiled_module_path(code)
+    path = next(
+        (base + ext for ext in (".py", ".pyc") if os.path.isfile(base + ext)),
+        None,
+    )
+    if path is None:
+        return None
+    # Loaded by path, a module of the same name elsewhere on `sys.path`
+    # is never picked up
+    from importlib.util import module_from_spec, spec_from_file_location
+
+    spec = spec_from_file_location(os.path.basename(base), path)
+    if spec is None or spec.loader is None:
+        return None
+    module = module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except (ImportError, OSError, SyntaxError):
+        return None
+    if getattr(module, "VERSION", None) != COMPILED_VERSION:
+        return None
+    # Compiled from this script, not copied over from another one
+    script = os.path.basename(base)[: -len(COMPILED_SUFFIX)]
+    if getattr(module, "SCRIPT", None) != script:
+        return None
+    return module.FUNCTIONS.get(cache_key(code))
+
+
+def load_code_params(code: Callable[..., Any]) -> list[Param]:
+    # Like `__pycache__`, warm starts skip `tokenize` and `ast` entirely
+    filename = code.__code__.co_filename
+    if os.environ.get(CACHE_DISABLE_ENV) or not os.path.isfile(filename):
+        return extract_code_params(code)
+    key = cache_key(code)
+    cache = read_spec_cache(filename)
+    specs = cache.get("functions", {}).get(key)
+    if specs is not None:
+        params = params_from_spec(code, specs)
+        if params is not None:
+            return params
+
+    params = extract_code_params(code)
+    if not cache:
+        try:
+            cache = {
+                "version": CACHE_VERSION,
+                "path": os.path.abspath(filename),
+                "sha256": source_hash(filename),
+                **source_fingerprint(filename),
+                "functions": {},
+            }
+        except OSError:
+            return params
+    cache["functions"][key] = [param_to_spec(param) for param in params]
+    write_spec_cache(filename, cache)
+    return params
@@ -0,0 +1,7 @@
+import pytest
+from simplecli import simplecli
+
+
+@pytest.fixture(autouse=True)
+def ensure_wrapped_not_flagged():
+    simplecli._wrapped = False
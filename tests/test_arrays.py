@@ -0,0 +1,114 @@
+import pickle
+import pytest
+import sys
+import tracemalloc
+import simplecli as package
+from array import array
+from simplecli import FloatArray, IntArray, simplecli
+from simplecli.arraytypes import CHUNK_SIZE, ArrayValueError
+from simplecli.completion import NUMBER, value_hint
+from tests.utils import simplecli_wrap_main
+
+
+def test_param_accepts_arrays():
+    param = simplecli.Param("values", annotation=IntArray)
+    assert param.help_type == "IntArray"
+    assert param.spec.is_seq
+    assert param.spec.is_array
+    assert value_hint(param) == NUMBER
+
+
+def test_direct_construction():
+    assert IntArray(["1", "-2"]) == array("q", [1, -2])
+    assert FloatArray(["1.5", "2"]) == array("d", [1.5, 2.0])
+    with pytest.raises(ArrayValueError) as e:
+        IntArray(["1", "2", "x"])
+    assert (e.value.index, e.value.value) == (2, "x")
+
+
+def test_arrays_are_array_subclasses():
+    values = FloatArray(["0.5"])
+    assert isinstance(values, FloatArray)
+    assert values.typecode == "d"
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(values, protocol))  # noqa: S301
+        assert type(copy) is FloatArray
+        assert copy == values
+
+
+def test_invalid_value_in_later_chunk():
+    values = ["1"] * (CHUNK_SIZE + 5) + ["1.5"]
+    with pytest.raises(ArrayValueError) as e:
+        IntArray(iter(values))
+    assert (e.value.index, e.value.value) == (CHUNK_SIZE + 5, "1.5")
+
+
+def test_wrap_int_array(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "3", "1", "2", "--scale=2"])
+
+    def code(values: IntArray, scale: int = 1):
+        assert values.typecode == "q"
+        return sum(values) * scale
+
+    assert simplecli_wrap_main(code) == 12
+
+
+def test_wrap_float_array_after_positional(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "x", "0.5", "1e3"])
+
+    def code(name: str, values: FloatArray):
+        return name, values
+
+    assert simplecli_wrap_main(code) == ("x", array("d", [0.5, 1000.0]))
+
+
+def test_empty_array():
+    def code(values: FloatArray):
+        return values
+
+    assert package.invoke(code, []) == array("d")
+
+
+def test_invalid_value_index():
+    def code(values: FloatArray):
+        return values
+
+    with pytest.raises(package.ArgumentError) as e:
+        package.invoke(code, ["1", "2", "three"])
+    assert e.value.index == 2
+    assert str(e.value) == (
+        "'values' must be of type FloatArray, index 2 is 'three'"
+    )
+
+
+def test_out_of_range_int(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "1", str(1 << 63)])
+
+    def code(values: IntArray):
+        return values
+
+    with pytest.raises(SystemExit, match=f"IntArray, index 1 is '{1 << 63}'"):
+        simplecli_wrap_main(code)
+
+
+def test_smaller_than_list():
+    argv = [str(i) for i in range(100_000)]
+
+    def as_list(values: list[float]):
+        return values
+
+    def as_array(values: FloatArray):
+        return values
+
+    peaks = []
+    for code in (as_list, as_array):
+        package.invoke(code, ["1"])
+        tracemalloc.start()
+        try:
+            result = package.invoke(code, argv)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+        assert len(result) == 100_000
+        del result
+    assert peaks[1] < peaks[0] / 2
@@ -0,0 +1,148 @@
+import asyncio
+import io
+import pytest
+import sys
+from simplecli import OutputFile
+from tests.utils import simplecli_wrap_main
+
+
+async def async_square(value: int):
+    await asyncio.sleep(0)
+    return value * value
+
+
+active: list[int] = []
+
+
+async def async_in_flight(value: int):
+    # Runs in a worker process, which has its own `active`
+    active.append(value)
+    await asyncio.sleep(0.01)
+    in_flight = len(active)
+    active.remove(value)
+    return in_flight
+
+
+def test_wrap_async(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "12"])
+
+    async def code(
+        a: int,  # async value
+    ):
+        await asyncio.sleep(0)
+        return a + 1
+
+    assert simplecli_wrap_main(code) == 13
+
+
+def test_wrap_async_help(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--help"])
+
+    async def code(
+        a: int,  # async value
+    ):
+        pass
+
+    with pytest.raises(SystemExit, match="async value"):
+        simplecli_wrap_main(code)
+
+
+def test_async_batch_concurrency(capsys, monkeypatch):
+    argv = ["filename", "--simplecli-batch", "--simplecli-concurrency=5"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join("0123456789")))
+    active = []
+    peak = []
+
+    async def code(a: int):
+        active.append(a)
+        peak.append(len(active))
+        await asyncio.sleep(0.05)
+        active.remove(a)
+        return a
+
+    simplecli_wrap_main(code)
+    assert max(peak) == 5
+    assert capsys.readouterr().out == "".join(f"{i}\n" for i in range(10))
+
+
+def test_async_batch_unordered(capsys, monkeypatch):
+    argv = ["filename", "--simplecli-batch", "--simplecli-unordered"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("3\n1\n2\n"))
+
+    async def code(a: int):
+        await asyncio.sleep(a / 50)
+        return a
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "1\n2\n3\n"
+
+
+def test_async_batch_errors(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-batch"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1\n0\nx\n"))
+
+    async def code(a: int):
+        return 1 // a
+
+    with pytest.raises(SystemExit, match="2 of 3 batch lines failed"):
+        simplecli_wrap_main(code)
+    captured = capsys.readouterr()
+    assert captured.out == "1\n"
+    assert "line 2: ZeroDivisionError" in captured.err
+    assert "line 3: 'a' must be of type int" in captured.err
+
+
+def test_async_jobs(capsys, monkeypatch):
+    argv = ["filename", "--simplecli-jobs=2", "1", "2", "3"]
+    monkeypatch.setattr(sys, "argv", argv)
+    simplecli_wrap_main(async_square)
+    assert capsys.readouterr().out == "1\n4\n9\n"
+
+
+def test_async_jobs_concurrency(capsys, monkeypatch):
+    argv = [
+        "filename",
+        "--simplecli-jobs=1",
+        "--simplecli-chunksize=8",
+        "--simplecli-concurrency=3",
+        *"12345678",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    simplecli_wrap_main(async_in_flight)
+    in_flight = [int(line) for line in capsys.readouterr().out.split()]
+    assert len(in_flight) == 8
+    assert max(in_flight) == 3
+
+
+def test_async_map_without_jobs(capsys, monkeypatch):
+    argv = ["filename", "--simplecli-concurrency=2", "1", "2", "3"]
+    monkeypatch.setattr(sys, "argv", argv)
+    simplecli_wrap_main(async_square)
+    assert capsys.readouterr().out == "1\n4\n9\n"
+
+
+def test_sync_map_requires_mode(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-concurrency=2"])
+
+    def code(a: int):
+        return a
+
+    with pytest.raises(SystemExit, match="'--simplecli-batch' or"):
+        simplecli_wrap_main(code)
+
+
+def test_async_batch_closes_files(capsys, monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-batch"])
+    lines = "\n".join(str(tmp_path / f"out{i}.txt") for i in range(3))
+    monkeypatch.setattr(sys, "stdin", io.StringIO(lines))
+    seen = []
+
+    async def code(dst: OutputFile):
+        seen.append(dst)
+        dst.write("x")
+
+    simplecli_wrap_main(code)
+    assert [dst._file for dst in seen] == [None, None, None]
+    assert (tmp_path / "out2.txt").read_text() == "x"
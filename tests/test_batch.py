@@ -0,0 +1,127 @@
+import io
+import pytest
+import sys
+from tests.utils import simplecli_wrap_main
+
+
+def test_batch_stdin(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-batch"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1 2\n\n--a=3 --b=4\n5\n"))
+    calls = []
+
+    def code(a: int, b: int = 10):
+        calls.append((a, b))
+        return a + b
+
+    simplecli_wrap_main(code)
+    assert calls == [(1, 2), (3, 4), (5, 10)]
+    assert capsys.readouterr().out == "3\n7\n15\n"
+
+
+def test_batch_file(capfd, monkeypatch, tmp_path):
+    batch = tmp_path / "batch.txt"
+    batch.write_text("'Dade Murphy'\n\"Kate Libby\"\n")
+    monkeypatch.setattr(sys, "argv", ["fn", f"--simplecli-batch={batch}"])
+
+    def code(name: str):
+        print(f"Hello, {name}!")
+
+    simplecli_wrap_main(code)
+    out = capfd.readouterr().out
+    assert out == "Hello, Dade Murphy!\nHello, Kate Libby!\n"
+
+
+def test_batch_errors_continue(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-batch"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1\nfoo\n0\n--b=2\n3\n"))
+
+    def code(a: int):
+        return 10 // a
+
+    with pytest.raises(SystemExit, match="3 of 5 batch lines failed"):
+        simplecli_wrap_main(code)
+    captured = capsys.readouterr()
+    assert captured.out == "10\n3\n"
+    assert "line 2: 'a' must be of type int" in captured.err
+    assert "line 3: ZeroDivisionError" in captured.err
+    assert "line 4: Error, missing required argument" in captured.err
+
+
+def test_batch_values_reset(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-batch"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("--flag --a=1\n--a=2\n"))
+
+    def code(a: int, flag: bool = False):
+        return f"{a} {flag}"
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "1 True\n2 False\n"
+
+
+def test_batch_rejects_command_line_args(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "1", "--simplecli-batch"])
+
+    def code(a: int):
+        pass
+
+    with pytest.raises(SystemExit, match="via batch input"):
+        simplecli_wrap_main(code)
+
+
+def test_batch_missing_file(monkeypatch, tmp_path):
+    missing = tmp_path / "missing.txt"
+    monkeypatch.setattr(sys, "argv", ["fn", f"--simplecli-batch={missing}"])
+
+    def code(a: int):
+        pass
+
+    with pytest.raises(SystemExit, match="unable to read batch input"):
+        simplecli_wrap_main(code)
+
+
+def test_batch_output_format(capsys, monkeypatch):
+    argv = ["filename", "--simplecli-batch", "--simplecli-output=tsv"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1 2\n3 4\n"))
+
+    def code(a: int, b: int):
+        return a, b, a + b
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "1\t2\t3\n3\t4\t7\n"
+
+
+def test_batch_flush(monkeypatch):
+    writes = []
+
+    class Out:
+        def write(self, text):
+            writes.append(text)
+
+        def flush(self):
+            writes.append("|")
+
+    argv = ["fn", "--simplecli-batch", "--simplecli-flush=2"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1\n2\n3\n4\n5\n"))
+    monkeypatch.setattr(sys, "stdout", Out())
+
+    def code(a: int):
+        return a
+
+    simplecli_wrap_main(code)
+    # Every second record, then once when the batch is done
+    assert "".join(writes) == "1\n2\n|3\n4\n|5\n|"
+
+
+def test_batch_generator(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-batch"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("2\nx\n3\n"))
+
+    def code(count: int):
+        for i in range(count):
+            yield f"{count}.{i}"
+
+    with pytest.raises(SystemExit, match="1 of 3 batch lines failed"):
+        simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "2.0\n2.1\n3.0\n3.1\n3.2\n"
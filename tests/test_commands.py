@@ -0,0 +1,143 @@
+import pytest
+import sys
+from typing import Any, Callable
+import simplecli as simplecli_package
+from simplecli import simplecli
+
+__version__ = "4.5.6"
+
+
+@pytest.fixture(autouse=True)
+def ensure_clean_registry():
+    simplecli._wrapped = False
+    simplecli._commands.clear()
+    yield
+    simplecli._commands.clear()
+
+
+def register_main(*funcs: Callable[..., Any]):
+    for func in funcs:
+        func_name = func.__globals__["__name__"]
+        func.__globals__["__name__"] = "__main__"
+        try:
+            simplecli_package.command(func)
+        finally:
+            func.__globals__["__name__"] = func_name
+
+
+def build(
+    target: str,  # What to build
+    release: bool = False,  # Optimize the build
+):
+    """
+    Build the project
+    """
+    return f"build {target} release={release}"
+
+
+def push_image(tag: str = "latest"):
+    """Push the image"""
+    return f"push {tag}"
+
+
+def broken(foo: dict):
+    pass
+
+
+def test_dispatch_command(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "build", "app", "--release"])
+    register_main(build, push_image)
+    assert simplecli_package.dispatch() == "build app release=True"
+
+
+def test_dispatch_hyphenated_command(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "push-image", "--tag=v1"])
+    register_main(build, push_image)
+    assert simplecli_package.dispatch() == "push v1"
+
+
+def test_dispatch_extracts_only_invoked(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "push-image"])
+    extracted = []
+    load_code_params = simplecli.load_code_params
+
+    def tracking_load(code):
+        extracted.append(code.__name__)
+        return load_code_params(code)
+
+    monkeypatch.setattr(simplecli, "load_code_params", tracking_load)
+    # `broken` has an unsupported annotation, but is never extracted
+    register_main(build, push_image, broken)
+    assert simplecli_package.dispatch() == "push latest"
+    assert extracted == ["push_image"]
+
+
+def test_dispatch_unsupported_type(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "broken"])
+    register_main(build, broken)
+    with pytest.raises(SystemExit) as e:
+        simplecli_package.dispatch()
+    # The script is the file, the command is where it happened
+    first, line, error = e.value.args[0].splitlines()
+    assert first.startswith('File "tool", line ')
+    assert first.endswith(", in broken")
+    assert line == "def broken(foo: dict):"
+    assert error == "UnsupportedType: <class 'dict'>"
+
+
+def test_dispatch_help(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "--help"])
+    monkeypatch.setattr(simplecli, "load_code_params", None)
+    register_main(build, push_image)
+    with pytest.raises(SystemExit) as e:
+        simplecli_package.dispatch()
+    help_msg = e.value.args[0]
+    assert "tool <command> [options]" in help_msg
+    assert "  build        Build the project" in help_msg
+    assert "  push-image   Push the image" in help_msg
+
+
+def test_dispatch_no_command(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool"])
+    register_main(build)
+    with pytest.raises(SystemExit, match="Commands:"):
+        simplecli_package.dispatch()
+
+
+def test_dispatch_unknown_command(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "deploy"])
+    register_main(build)
+    with pytest.raises(SystemExit, match="Unknown command 'deploy'"):
+        simplecli_package.dispatch()
+
+
+def test_dispatch_command_help(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "build", "--help"])
+    register_main(build)
+    with pytest.raises(SystemExit) as e:
+        simplecli_package.dispatch()
+    help_msg = e.value.args[0]
+    assert "tool build [target]" in help_msg
+    assert "What to build" in help_msg
+
+
+def test_dispatch_version(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["tool", "--version"])
+    register_main(build)
+    with pytest.raises(SystemExit, match="tool version 4.5.6"):
+        simplecli_package.dispatch()
+
+
+def test_dispatch_without_commands():
+    assert simplecli_package.dispatch() is None
+
+
+def test_command_not_main():
+    assert simplecli_package.command(build) is build
+    assert simplecli._commands == {}
+
+
+def test_command_after_wrap():
+    simplecli._wrapped = True
+    with pytest.raises(SystemExit, match="cannot be combined"):
+        register_main(build)
@@ -0,0 +1,104 @@
+import importlib.util
+import os
+import pytest
+import sys
+from simplecli import simplecli
+from simplecli.compiler import compile_script
+
+
+SCRIPT = '''
+import simplecli
+
+
+@simplecli.wrap
+def main(
+    foo: int,  # the foo
+    bar: str = "baz",  # the bar
+):
+    """
+    Does things
+    """
+    pass
+'''
+
+
+def load_script(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "aot.py"
+    path.write_text(SCRIPT)
+    return path
+
+
+def no_extraction(code):
+    raise AssertionError("source should not be read")
+
+
+def test_compile_writes_module(script):
+    output = compile_script(str(script))
+    assert output == str(script.parent / "aot_simplecli.py")
+    assert os.path.isfile(output)
+
+
+def test_compiled_params_skip_source(script, monkeypatch):
+    compile_script(str(script))
+    func = load_script(script)
+    monkeypatch.setattr(simplecli, "load_code_params", no_extraction)
+    params, help_msg = simplecli.wrapped_params(func, "aot.py")
+    assert [p.name for p in params] == ["foo", "bar"]
+    assert [p.description for p in params] == ["the foo", "the bar"]
+    assert help_msg.startswith("Usage:\n  aot.py [foo]")
+    assert "Does things" in help_msg
+
+
+def test_compiled_help_matches_live(script):
+    func = load_script(script)
+    params = simplecli.extract_code_params(func)
+    internal = simplecli.internal_params(func, "aot.py")
+    docstring = simplecli.format_docstring(func.__doc__)
+    expected = simplecli.help_text("aot.py", params + internal, docstring)
+    compile_script(str(script))
+    assert simplecli.wrapped_params(func, "aot.py")[1] == expected
+
+
+def test_stale_compiled_module_ignored(script):
+    compile_script(str(script))
+    script.write_text(SCRIPT.replace("foo: int", "foo: float"))
+    func = load_script(script)
+    params, help_msg = simplecli.wrapped_params(func, "aot.py")
+    assert help_msg == ""
+    assert params[0].annotation is float
+
+
+def test_compile_without_functions(tmp_path):
+    path = tmp_path / "empty.py"
+    path.write_text("x = 1\n")
+    with pytest.raises(SystemExit, match="no `@wrap` or `@command`"):
+        compile_script(str(path))
+
+
+def test_compiled_module_on_sys_path_ignored(script, tmp_path, monkeypatch):
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    compile_script(str(script), str(other / "aot_simplecli.py"))
+    monkeypatch.syspath_prepend(str(other))
+    func = load_script(script)
+    assert simplecli.wrapped_params(func, "aot.py")[1] == ""
+    assert "aot_simplecli" not in sys.modules
+
+
+def test_compiled_module_for_another_script_ignored(script, tmp_path):
+    other = tmp_path / "other.py"
+    other.write_text(SCRIPT)
+    os.rename(compile_script(str(other)), tmp_path / "aot_simplecli.py")
+    func = load_script(script)
+    assert simplecli.wrapped_params(func, "aot.py")[1] == ""
+    # The same script compiled under its own name is used
+    compile_script(str(script))
+    assert simplecli.wrapped_params(func, "aot.py")[1] != ""
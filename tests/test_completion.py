@@ -0,0 +1,109 @@
+import pytest
+import shutil
+import subprocess
+from simplecli.completion import completion_script
+
+
+WRAPPED = """
+import simplecli
+
+
+@simplecli.wrap
+def main(
+    name: str,  # Who's there
+    count: int = 1,  # How many
+    loud: bool = False,  # Shout
+):
+    pass
+"""
+
+COMMANDS = '''
+import simplecli
+
+
+@simplecli.command
+def add_item(
+    name: str,  # Item name
+    ratio: float = 0.5,
+):
+    """
+    Add an item
+    """
+
+
+@simplecli.command
+def remove(name: str):
+    """Remove it"""
+
+
+simplecli.dispatch()
+'''
+
+
+def write(tmp_path, source, name="tool.py"):
+    path = tmp_path / name
+    path.write_text(source)
+    return str(path)
+
+
+def complete_bash(script, *words: str):
+    test = (
+        f"{script}\n"
+        'COMP_WORDS=("$@"); COMP_CWORD=$((${#COMP_WORDS[@]} - 1))\n'
+        "_simplecli_tool_py 2>/dev/null\n"
+        'echo "${COMPREPLY[*]}"'
+    )
+    return subprocess.run(
+        ["bash", "-c", test, "bash", "tool.py", *words],  # noqa: S603, S607
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
+def test_bash_wrapped(tmp_path):
+    script = completion_script(write(tmp_path, WRAPPED), "bash")
+    assert "opts='--name= --count= --loud --help'" in script
+    assert script.endswith("complete -F _simplecli_tool_py tool.py")
+
+
+@pytest.mark.skipif(not shutil.which("bash"), reason="bash not available")
+def test_bash_completes(tmp_path):
+    script = completion_script(write(tmp_path, COMMANDS), "bash")
+    assert complete_bash(script, "") == "add-item remove --help"
+    assert complete_bash(script, "add-item", "--r") == "--ratio="
+    assert complete_bash(script, "remove", "--") == "--name= --help"
+    # Numbers are not completed from files
+    assert complete_bash(script, "add-item", "--ratio", "=") == ""
+
+
+def test_zsh(tmp_path):
+    script = completion_script(write(tmp_path, WRAPPED), "zsh")
+    assert script.startswith("#compdef tool.py\n")
+    assert "'--name=[Who'\\''s there]:str:_files'" in script
+    assert "'--count=[How many]:int: '" in script
+    assert "'--loud[Shout]'" in script
+
+
+def test_zsh_commands(tmp_path):
+    script = completion_script(write(tmp_path, COMMANDS), "zsh")
+    assert "'add-item:Add an item'" in script
+    assert "'remove:Remove it'" in script
+
+
+def test_fish(tmp_path):
+    script = completion_script(write(tmp_path, COMMANDS), "fish", "tool")
+    lines = script.splitlines()
+    assert lines[0] == (
+        "complete -c tool -f -n __fish_use_subcommand "
+        "-a 'add-item' -d 'Add an item'"
+    )
+    assert (
+        "complete -c tool -n '__fish_seen_subcommand_from add-item' "
+        "-l ratio -x"
+    ) in lines
+
+
+def test_unknown_shell(tmp_path):
+    with pytest.raises(SystemExit, match="unsupported shell 'csh'"):
+        completion_script(write(tmp_path, WRAPPED), "csh")
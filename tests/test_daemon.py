@@ -0,0 +1,148 @@
+import os
+import pytest
+import socket
+import subprocess
+import sys
+import time
+from simplecli import simplecli
+from simplecli.client import default_socket_path, peer_uid
+from simplecli.daemon import listen
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="fork and Unix sockets are required"
+)
+
+SCRIPT = """
+import simplecli
+import sys
+
+
+@simplecli.wrap
+def main(name: str, code: int = 0):
+    print("{greeting}", name, sys.stdin.read().strip(), os.getcwd())
+    sys.exit(code)
+"""
+
+
+def write_script(path, greeting="hello"):
+    path.write_text("import os\n" + SCRIPT.replace("{greeting}", greeting))
+
+
+@pytest.fixture
+def env(tmp_path):
+    root = os.path.dirname(os.path.dirname(simplecli.__file__))
+    return {
+        **os.environ,
+        "PYTHONPATH": root,
+        "SIMPLECLI_SOCKET": str(tmp_path / "s.sock"),
+    }
+
+
+@pytest.fixture
+def server(tmp_path, env):
+    script = tmp_path / "tool.py"
+    write_script(script)
+    serve = f"--simplecli-serve={tmp_path}/s.sock"
+    proc = subprocess.Popen(
+        [sys.executable, str(script), serve],  # noqa: S603
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    deadline = time.monotonic() + 10
+    while not (tmp_path / "s.sock").exists():
+        assert proc.poll() is None, proc.stderr.read()
+        assert time.monotonic() < deadline, "server did not start"
+        time.sleep(0.01)
+    yield script
+    proc.terminate()
+    proc.wait(10)
+    assert not (tmp_path / "s.sock").exists()
+
+
+def call(script, env, *args: str, stdin=""):
+    client = [sys.executable, "-m", "simplecli.client"]
+    return subprocess.run(
+        [*client, str(script), *args],  # noqa: S603
+        input=stdin,
+        capture_output=True,
+        cwd=script.parent,
+        env=env,
+        text=True,
+        timeout=10,
+    )
+
+
+def test_served_call(server, env):
+    result = call(server, env, "bob", "--code=3", stdin="piped")
+    assert result.stdout == f"hello bob piped {server.parent}\n"
+    assert result.returncode == 3
+
+
+def test_served_errors(server, env):
+    result = call(server, env)
+    assert result.returncode == 1
+    assert "missing required argument" in result.stderr
+
+
+def test_reload_on_change(server, env):
+    assert call(server, env, "a").stdout.startswith("hello a")
+    write_script(server, "hi")
+    stat = server.stat()
+    os.utime(server, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert call(server, env, "b").stdout.startswith("hi b")
+    assert call(server, env, "c").stdout.startswith("hi c")
+
+
+def test_client_without_server(tmp_path, env):
+    script = tmp_path / "tool.py"
+    write_script(script)
+    result = call(script, env, "direct", stdin="in")
+    assert result.stdout == f"hello direct in {tmp_path}\n"
+
+
+def test_default_socket_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    path = default_socket_path("dir/tool.py", create=True)
+    assert path.startswith(f"{tmp_path}/simplecli/tool-")
+    assert path != default_socket_path("other/tool.py")
+    assert os.stat(tmp_path / "simplecli").st_mode & 0o777 == 0o700
+
+
+def test_default_socket_path_needs_private_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        default_socket_path("tool.py")
+    (tmp_path / "simplecli").mkdir(mode=0o755)
+    os.chmod(tmp_path / "simplecli", 0o755)  # noqa: S103
+    with pytest.raises(PermissionError):
+        default_socket_path("tool.py", create=True)
+
+
+def test_peer_uid():
+    left, right = socket.socketpair(socket.AF_UNIX)
+    with left, right:
+        assert peer_uid(left) in (None, os.getuid())
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "getuid") or os.getuid() != 0,
+    reason="changing a file's owner requires root",
+)
+def test_listen_keeps_other_users_socket(tmp_path):
+    path = str(tmp_path / "s.sock")
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(path)
+    sock.close()
+    os.chown(path, 12345, 12345)
+    with pytest.raises(SystemExit, match="belongs to another user"):
+        listen(path)
+    assert os.path.exists(path)
+
+
+def test_listen_keeps_other_files(tmp_path):
+    path = tmp_path / "s.sock"
+    path.write_text("data")
+    with pytest.raises(SystemExit, match="not a socket"):
+        listen(str(path))
+    assert path.read_text() == "data"
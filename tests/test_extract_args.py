@@ -1,3 +1,4 @@
+import functools
 import typing
 from simplecli import simplecli
 
@@ -473,3 +474,71 @@ def test_two_args_unrelated_comment():
         simplecli.Param(name="a", annotation=int),
         simplecli.Param(name="b", annotation=int),
      ]
+
+
+def test_body_names_and_comments_ignored():
+    def code(
+        a: int,  # this is A
+        b: int,
+    ):
+        # b: not a description
+        a = b  # nor this
+        return a  # noqa: RET504
+
+    params = simplecli.extract_code_params(code)
+    assert params == [
+        simplecli.Param(name="a", annotation=int, description="this is A"),
+        simplecli.Param(name="b", annotation=int),
+     ]
+
+
+def test_signature_tokens_stop_at_signature():
+    def code(
+        a: int,
+        b: str = "(",  # unbalanced
+    ) -> typing.Optional[int]:  # trailing
+        return (
+            a
+        )
+
+    tokens, fd_end = simplecli.signature_tokens(code)
+    assert tokens[0].string == "def"
+    assert tokens[-1].string == "# trailing"
+    assert "return" not in [token.string for token in tokens]
+    assert fd_end == tokens[0].start[0] + 2
+
+
+def test_signature_oneline_body():
+    def code(foo: int = 123): return foo  # the foo
+
+    params = simplecli.extract_code_params(code)
+    assert params == [
+        simplecli.Param(
+            name="foo",
+            annotation=int,
+            default=123,
+            description="the foo",
+        )
+    ]
+
+
+def test_signature_parts_match_inspect():
+    def code(a: int, b: str = "x", *c: str, d: float, e: bool = True):
+        pass
+
+    def wrapper(*args: str, **kwargs: str):
+        pass
+
+    wrapper.__wrapped__ = code
+    expected = [
+        ("a", simplecli.Empty, int),
+        ("b", "x", str),
+        ("c", simplecli.Empty, str),
+        ("d", simplecli.Empty, float),
+        ("e", True, bool),
+    ]
+    assert simplecli.signature_parts(code) == expected
+    # Not plain functions, read through `inspect.signature`
+    assert simplecli.signature_parts(wrapper) == expected
+    partial = functools.partial(code, 1)
+    assert simplecli.signature_parts(partial) == expected[1:]
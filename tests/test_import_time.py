@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["ast", "inspect", "json", "hashlib", "textwrap", "tokenize"]
+IMPORT_ONLY = f"""
+import sys
+import simplecli
+
+
+def code(a: int):
+    return a
+
+
+code = simplecli.wrap(code)
+assert code(1) == 1
+print(" ".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def run_python(*args: str):
+    return subprocess.run(
+        [sys.executable, *args],  # noqa: S603
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def cumulative_import_us(module):
+    stderr = run_python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_import_skips_heavy_modules():
+    # `-c` code runs as `__main__`, so wrap from a differently named module
+    code = f"exec({IMPORT_ONLY!r}, {{'__name__': 'not_main'}})"
+    assert run_python("-c", code).stdout.strip() == ""
+
+
+def test_import_time_below_inspect():
+    simplecli_us = min(cumulative_import_us("simplecli") for _ in range(3))
+    inspect_us = min(cumulative_import_us("inspect") for _ in range(3))
+    assert simplecli_us < inspect_us
+
+
+def test_cached_start_skips_parser_modules(tmp_path):
+    script = tmp_path / "tool.py"
+    script.write_text(
+        "import sys\n"
+        "from simplecli import wrap\n"
+        "\n"
+        "\n"
+        "@wrap\n"
+        "def main(\n"
+        "    name: str,  # Who to greet\n"
+        "    tags: list[str],\n"
+        "    loud: bool = False,\n"
+        "):\n"
+        "    parser = ['array', 'ast', 'inspect', 'tokenize', 'typing']\n"
+        "    print(' '.join(m for m in parser if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": root, "PYTHONDONTWRITEBYTECODE": ""}
+    env.pop("SIMPLECLI_NO_CACHE", None)
+    argv = [sys.executable, str(script), "x"]
+    for _ in range(2):
+        result = subprocess.run(
+            argv,  # noqa: S603
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+    # The first run parses the signature and writes the spec cache
+    assert result.stdout.strip() == ""
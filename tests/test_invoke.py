@@ -0,0 +1,164 @@
+import pickle
+import pytest
+import sys
+import simplecli as package
+from simplecli import simplecli
+
+
+def add(a: int, b: int = 2, verbose: bool = False) -> int:
+    """Add two numbers"""
+    return a + b
+
+
+def test_invoke_returns_result():
+    assert package.invoke(add, ["1"]) == 3
+    assert package.invoke(add, ["1", "--b=5"]) == 6
+    assert package.invoke(add, ["--a=4", "--verbose"]) == 6
+
+
+def test_invoke_leaves_global_state_alone(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--help"])
+    monkeypatch.setattr(simplecli, "_wrapped", False)
+    for i in range(1000):
+        assert package.invoke(add, [str(i)]) == i + 2
+    assert not simplecli._wrapped
+    assert sys.argv == ["filename", "--help"]
+
+
+def test_invoke_is_not_limited_to_main():
+    assert add.__globals__["__name__"] != "__main__"
+    assert package.invoke(add, ["1", "1"]) == 2
+
+
+def test_invalid_value():
+    with pytest.raises(package.ArgumentError) as e:
+        package.invoke(add, ["one"])
+    assert e.value.kind == "invalid"
+    assert e.value.params == ["a"]
+    assert str(e.value) == "'a' must be of type int"
+
+
+def test_missing_argument():
+    with pytest.raises(package.ArgumentError) as e:
+        package.invoke(add, [])
+    assert e.value.kind == "missing"
+    assert e.value.params == ["a"]
+    assert str(e.value) == "Error, missing required argument:\n  --a"
+
+
+def test_too_many_arguments():
+    def one(a: int) -> int:
+        return a
+
+    with pytest.raises(package.ArgumentError) as e:
+        package.invoke(one, ["1", "2"])
+    assert e.value.kind == "too_many"
+    assert e.value.params == []
+
+
+def test_unexpected_argument():
+    with pytest.raises(package.ArgumentError) as e:
+        package.invoke(add, ["1", "--nope", "--simplecli-jobs=2"])
+    assert e.value.kind == "unexpected"
+    assert e.value.params == ["nope", "simplecli_jobs"]
+
+
+def test_argument_error_is_a_usage_and_type_error():
+    with pytest.raises(package.UsageError):
+        package.invoke(add, [])
+    with pytest.raises(TypeError):
+        package.invoke(add, [])
+
+
+def test_argument_error_pickles():
+    error = package.ArgumentError("a", "b", kind="missing", params=["x"])
+    copy = pickle.loads(pickle.dumps(error))  # noqa: S301
+    assert (copy.args, copy.kind, copy.params) == (
+        ("a", "b"),
+        "missing",
+        ["x"],
+    )
+
+
+def test_help_requested():
+    with pytest.raises(package.HelpRequested) as e:
+        package.invoke(add, ["--help"], prog="adder")
+    assert str(e.value).startswith("Usage:\n  adder [a]")
+    assert "Add two numbers" in str(e.value)
+
+
+def test_version_requested():
+    def code(a: int) -> int:
+        return a
+
+    code.__globals__["__version__"] = "1.2.3"
+    try:
+        with pytest.raises(package.VersionRequested, match="code version"):
+            package.invoke(code, ["--version"])
+    finally:
+        del code.__globals__["__version__"]
+
+
+def test_version_without_version_is_unexpected():
+    with pytest.raises(package.ArgumentError, match="'version'"):
+        package.invoke(add, ["1", "--version"])
+
+
+def test_definition_errors_raise():
+    def untyped(a):
+        return a
+
+    def unsupported(a: [str, int]):
+        return a
+
+    with pytest.raises(package.MissingTypeHint):
+        package.invoke(untyped, ["1"])
+    with pytest.raises(package.UnsupportedType):
+        package.invoke(unsupported, ["1"])
+
+
+def test_function_errors_propagate():
+    def code(a: int) -> int:
+        raise SystemExit(a)
+
+    with pytest.raises(SystemExit) as e:
+        package.invoke(code, ["3"])
+    assert e.value.code == 3
+
+
+def test_arg_files_are_not_expanded():
+    def code(a: str) -> str:
+        return a
+
+    assert package.invoke(code, ["@missing"]) == "@missing"
+
+
+def test_async_function():
+    async def code(a: int) -> int:
+        return a * 2
+
+    assert package.invoke(code, ["21"]) == 42
+
+
+def test_generator_returned_unconsumed(tmp_path):
+    path = tmp_path / "in.txt"
+    path.write_text("a\nb\n")
+
+    def code(src: package.InputFile):
+        for line in src:
+            yield line.strip()
+
+    assert list(package.invoke(code, [str(path)])) == ["a", "b"]
+
+
+def test_files_closed_after_call(tmp_path):
+    path = tmp_path / "in.txt"
+    path.write_text("data")
+    seen = []
+
+    def code(src: package.InputFile) -> str:
+        seen.append(src)
+        return src.read()
+
+    assert package.invoke(code, [str(path)]) == "data"
+    assert seen[0]._file is None
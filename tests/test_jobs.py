@@ -0,0 +1,146 @@
+import io
+import pytest
+import sys
+from collections.abc import Iterator
+from simplecli import MappedFile, OutputFile, batch
+from tests.utils import simplecli_wrap_main
+
+
+# Module level, so worker processes can unpickle them
+def square(value: int, offset: int = 0):
+    return value * value + offset
+
+
+def invert(value: int):
+    return 1 // value
+
+
+def test_jobs_ordered(capsys, monkeypatch):
+    argv = ["fn", "--simplecli-jobs=2", "--simplecli-chunksize=2"]
+    monkeypatch.setattr(sys, "argv", argv + ["1", "2", "3", "4", "5"])
+    simplecli_wrap_main(square)
+    assert capsys.readouterr().out == "1\n4\n9\n16\n25\n"
+
+
+def test_jobs_unordered(capsys, monkeypatch):
+    argv = ["fn", "--simplecli-jobs=3", "--simplecli-unordered"]
+    values = [str(i) for i in range(50)]
+    monkeypatch.setattr(sys, "argv", argv + values + ["--offset=1"])
+    simplecli_wrap_main(square)
+    out = capsys.readouterr().out.split()
+    assert sorted(map(int, out)) == [i * i + 1 for i in range(50)]
+
+
+def test_jobs_batch(capsys, monkeypatch):
+    argv = ["fn", "--simplecli-jobs=2", "--simplecli-batch", "--offset=10"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1\n2 --offset=0\n3\n"))
+    simplecli_wrap_main(square)
+    assert capsys.readouterr().out == "11\n4\n19\n"
+
+
+def test_jobs_errors(capsys, monkeypatch):
+    argv = ["fn", "--simplecli-jobs=2", "1", "0", "x", "1"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit, match="2 of 4 arguments failed"):
+        simplecli_wrap_main(invert)
+    captured = capsys.readouterr()
+    assert captured.out == "1\n1\n"
+    assert "argument 2: ZeroDivisionError" in captured.err
+    assert "argument 3: 'value' must be of type int" in captured.err
+
+
+def test_jobs_invalid(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-jobs=none", "1"])
+    with pytest.raises(SystemExit, match="must be a positive int"):
+        simplecli_wrap_main(square)
+
+
+def test_jobs_options_require_mode(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-chunksize=2", "1"])
+    with pytest.raises(SystemExit, match="or '--simplecli-jobs' required"):
+        simplecli_wrap_main(square)
+
+
+def test_jobs_unknown_option(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-jbos=2", "1"])
+    with pytest.raises(SystemExit, match="Unexpected argument"):
+        simplecli_wrap_main(square)
+
+
+def echo(value: str):
+    return value
+
+
+def test_jobs_arguments_parsed_once(capsys, monkeypatch, tmp_path):
+    (tmp_path / "foo").write_text("contents\n")
+    monkeypatch.chdir(tmp_path)
+    argv = ["fn", "--simplecli-jobs=1", "@@foo", "--simplecli-args0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("--name=zz\0a b\0"))
+    simplecli_wrap_main(echo)
+    assert capsys.readouterr().out == "@foo\n--name=zz\na b\n"
+
+
+def countdown(count: int):
+    yield from range(count, 0, -1)
+
+
+def test_jobs_generator(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-jobs=2", "2", "3"])
+    simplecli_wrap_main(countdown)
+    assert capsys.readouterr().out == "2\n1\n3\n2\n1\n"
+
+
+def total(values: Iterator[int], scale: int = 1):
+    assert not isinstance(values, list)
+    return sum(values) * scale
+
+
+def test_jobs_iterator_param(capsys, monkeypatch):
+    argv = ["fn", "--simplecli-jobs=2", "--simplecli-batch"]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1 2\n3 --scale=2\n1 x\n"))
+    with pytest.raises(SystemExit, match="1 of 3 batch lines failed"):
+        simplecli_wrap_main(total)
+    captured = capsys.readouterr()
+    assert captured.out == "3\n6\n"
+    assert "line 3: 'values' must be of type [int], index 1 is 'x'" in (
+        captured.err
+    )
+
+
+def size(data: MappedFile):
+    return len(data)
+
+
+def test_jobs_mapped_file_rejected(monkeypatch, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"data")
+    argv = ["fn", "--simplecli-jobs=2", str(path), str(path)]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit, match="'data' is a MappedFile, which"):
+        simplecli_wrap_main(size)
+
+
+def test_jobs_parent_values_closed(capsys, monkeypatch, tmp_path):
+    closed = []
+    close_chunk = batch.close_chunk
+
+    def tracking_close(chunk, future):
+        closed.extend(kwargs["dst"] for kwargs in chunk)
+        close_chunk(chunk, future)
+
+    monkeypatch.setattr(batch, "close_chunk", tracking_close)
+    paths = [str(tmp_path / name) for name in "ab"]
+    monkeypatch.setattr(sys, "argv", ["fn", "--simplecli-jobs=2", *paths])
+    simplecli_wrap_main(write_name)
+    assert capsys.readouterr().out == "ok\nok\n"
+    # Closed in this process once each chunk's worker finished with it
+    assert sorted(dst.name for dst in closed) == paths
+    assert (tmp_path / "b").read_text() == paths[1]
+
+
+def write_name(dst: OutputFile):
+    dst.write(dst.name)
+    return "ok"
@@ -0,0 +1,97 @@
+import io
+import pytest
+import sys
+from simplecli import (
+    BinaryInputFile,
+    BinaryOutputFile,
+    InputFile,
+    OutputFile,
+    simplecli,
+)
+from tests.utils import simplecli_wrap_main
+
+
+def test_copy_files(monkeypatch, tmp_path):
+    source = tmp_path / "in.txt"
+    source.write_text("one\ntwo\n")
+    target = tmp_path / "out.txt"
+    monkeypatch.setattr(sys, "argv", ["filename", str(source), str(target)])
+
+    def code(src: InputFile, dst: OutputFile):
+        for line in src:
+            dst.write(line.upper())
+        return src, dst
+
+    src, dst = simplecli_wrap_main(code)
+    assert target.read_text() == "ONE\nTWO\n"
+    # Closed by simplecli after the call
+    assert src._file is None and dst._file is None
+
+
+def test_untouched_output_not_created(monkeypatch, tmp_path):
+    target = tmp_path / "out.txt"
+    monkeypatch.setattr(sys, "argv", ["filename", f"--dst={target}"])
+
+    def code(dst: OutputFile):
+        return repr(dst)
+
+    assert simplecli_wrap_main(code) == f"<OutputFile '{target}'>"
+    assert not target.exists()
+
+
+def test_dash_is_stdio(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "-"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("a\nb\n"))
+
+    def code(src: InputFile, dst: OutputFile = "-"):  # type: ignore[assignment]
+        dst.writelines(reversed(src.readlines()))
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "b\na\n"
+
+
+def test_binary_mode(monkeypatch, tmp_path):
+    source = tmp_path / "in.bin"
+    source.write_bytes(b"\x00\x01")
+    target = tmp_path / "out.bin"
+    monkeypatch.setattr(sys, "argv", ["filename", str(source), str(target)])
+
+    def code(src: BinaryInputFile, dst: BinaryOutputFile):
+        dst.write(src.read()[::-1])
+
+    simplecli_wrap_main(code)
+    assert target.read_bytes() == b"\x01\x00"
+
+
+def test_buffer_size_subclass(tmp_path):
+    class SmallInput(InputFile):
+        buffer_size = 1024
+        encoding = "latin-1"
+
+    source = tmp_path / "in.txt"
+    source.write_bytes(b"caf\xe9")
+    with SmallInput(str(source)) as f:
+        assert f.read() == "café"
+        assert f.buffer.raw is not None
+    param = simplecli.Param("src", annotation=SmallInput)
+    assert param.help_type == "SmallInput"
+
+
+@pytest.mark.parametrize(
+    "annotation, path, reason",
+    [
+        (InputFile, "missing.txt", "No such file or directory"),
+        (InputFile, ".", "Is a directory"),
+        (OutputFile, "missing/out.txt", "No such file or directory"),
+    ],
+)
+def test_bad_paths(monkeypatch, tmp_path, annotation, path, reason):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["filename", path])
+
+    def code(f: annotation):
+        pass
+
+    with pytest.raises(SystemExit) as e:
+        simplecli_wrap_main(code)
+    assert str(e.value) == f"'f' cannot open '{path}': {reason}"
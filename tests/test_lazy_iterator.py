@@ -0,0 +1,184 @@
+import io
+import os
+import pytest
+import sys
+import tracemalloc
+import typing
+import simplecli as package
+from collections.abc import Iterable, Iterator
+from simplecli import simplecli
+from simplecli.simplecli import (
+    ArgumentError,
+    DefaultIfBool,
+    Param,
+    bind_params,
+    clean_args,
+    stream_args,
+)
+from tests.utils import simplecli_wrap_main
+
+
+@pytest.mark.parametrize(
+    "annotation",
+    [Iterator[int], Iterable[str], typing.Iterator[float]],
+)
+def test_param_accepts_iterators(annotation):
+    param = Param("values", annotation=annotation)
+    assert param.spec.is_seq
+    assert param.spec.is_lazy
+
+
+def test_values_converted_as_consumed():
+    consumed = []
+
+    def source():
+        for value in ("1", "2", "3"):
+            consumed.append(value)
+            yield value
+
+    params = [Param("values", annotation=Iterator[int])]
+    values = bind_params(params, source(), {})["values"]
+    assert consumed == []
+    assert next(values) == 1
+    assert consumed == ["1"]
+    assert list(values) == [2, 3]
+
+
+def test_later_params_keep_positionals_for_iterator():
+    params = [
+        Param("first", annotation=str),
+        Param("rest", annotation=Iterable[int]),
+        Param("last", annotation=str, default="x"),
+    ]
+    kwargs = bind_params(params, ["a", "1", "2"], {})
+    assert kwargs["first"] == "a"
+    assert kwargs["last"] == "x"
+    assert list(kwargs["rest"]) == [1, 2]
+
+
+def test_error_reports_index():
+    def code(numbers: Iterator[int]) -> int:
+        return sum(numbers)
+
+    with pytest.raises(ArgumentError) as e:
+        package.invoke(code, ["1", "2", "three", "4"])
+    assert e.value.kind == "invalid"
+    assert e.value.params == ["numbers"]
+    assert e.value.index == 2
+    assert str(e.value) == (
+        "'numbers' must be of type [int], index 2 is 'three'"
+    )
+
+
+def test_wrap_error_exits(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "1", "x"])
+
+    def code(numbers: Iterator[int]):
+        return sum(numbers)
+
+    with pytest.raises(SystemExit, match="index 1 is 'x'"):
+        simplecli_wrap_main(code)
+
+
+def test_wrap_args0_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "1", "--simplecli-args0"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("2\x003\x00"))
+
+    def code(numbers: Iterator[int]):
+        assert not isinstance(numbers, list)
+        assert list(numbers) == [1, 2, 3]
+
+    simplecli_wrap_main(code)
+
+
+def test_stream_args_matches_clean_args(tmp_path):
+    path = tmp_path / "args.txt"
+    path.write_text("b\n--flag\n--name=file\nc\n@@d\n")
+    argv = ["a", f"@{path}", "--name=argv", "e"]
+    pos_args, kw_args = stream_args(argv)
+    assert (list(pos_args), kw_args) == clean_args(argv)
+    assert not isinstance(stream_args(argv)[0], list)
+
+
+def test_stream_args_without_files_is_clean_args():
+    argv = ["a", "--b=1", "@@c"]
+    assert stream_args(argv) == clean_args(argv)
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/fd"), reason="needs /dev/fd")
+def test_stream_args_reads_pipes_once():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"b\n--flag\nc\n")
+    os.close(write_fd)
+    try:
+        pos_args, kw_args = stream_args(["a", f"@/dev/fd/{read_fd}", "d"])
+        assert (list(pos_args), kw_args) == (
+            ["a", "b", "c", "d"],
+            {"flag": DefaultIfBool},
+        )
+    finally:
+        os.close(read_fd)
+
+
+def test_stream_args_missing_file_is_literal(tmp_path):
+    argv = [f"@{tmp_path / 'missing'}", "@someone"]
+    assert stream_args(argv) == (argv, {})
+
+
+def peak_bytes(argv, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", *argv])
+    monkeypatch.setattr(simplecli, "_wrapped", False)
+    totals = []
+
+    def code(numbers: Iterator[int], scale: int = 1):
+        totals.append(sum(numbers) * scale)
+
+    tracemalloc.start()
+    try:
+        simplecli_wrap_main(code)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return totals[0], peak
+
+
+def test_memory_constant_for_response_files(monkeypatch, tmp_path):
+    peaks = []
+    for count in (20_000, 200_000):
+        path = tmp_path / f"numbers{count}.txt"
+        with open(path, "w") as f:
+            f.writelines(f"{i}\n" for i in range(count))
+            f.write("--scale=2\n")
+        total, peak = peak_bytes([f"@{path}"], monkeypatch)
+        assert total == count * (count - 1)
+        peaks.append(peak)
+    # Ten times the input, a list of the values would be several MB more
+    assert peaks[1] < peaks[0] * 1.5
+
+
+def test_memory_constant_for_args0(monkeypatch):
+    peaks = []
+    for count in (20_000, 200_000):
+        data = "\0".join(map(str, range(count)))
+        monkeypatch.setattr(sys, "stdin", io.StringIO(data))
+        total, peak = peak_bytes(["--simplecli-args0"], monkeypatch)
+        assert total == count * (count - 1) // 2
+        peaks.append(peak)
+    assert peaks[1] < peaks[0] * 1.5
+
+
+def test_files_opened_while_iterating_are_closed(monkeypatch, tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        paths.append(tmp_path / name)
+        paths[-1].write_text(name)
+    monkeypatch.setattr(sys, "argv", ["filename", *map(str, paths)])
+    seen = []
+
+    def code(sources: Iterator[package.InputFile]):
+        for source in sources:
+            seen.append(source)
+            source.read()
+
+    simplecli_wrap_main(code)
+    assert [source._file for source in seen] == [None, None]
@@ -0,0 +1,75 @@
+import pytest
+import sys
+from simplecli import MappedFile, simplecli
+from simplecli.filetypes import close_files
+from tests.utils import simplecli_wrap_main
+
+
+def test_param_accepts_mapped_file():
+    param = simplecli.Param("data", annotation=MappedFile)
+    assert param.help_type == "MappedFile"
+    assert param.required
+
+
+def test_mapped_view(monkeypatch, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello\nworld\n")
+    monkeypatch.setattr(sys, "argv", ["filename", str(path)])
+    seen = []
+
+    def code(data: MappedFile):
+        seen.append(data)
+        return data.readonly, data.tobytes().count(b"\n")
+
+    assert simplecli_wrap_main(code) == (True, 2)
+    # The map is closed once the function returns
+    with pytest.raises(ValueError):
+        seen[0].tobytes()
+
+
+def test_mapped_empty_file(monkeypatch, tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    monkeypatch.setattr(sys, "argv", ["filename", str(path)])
+
+    def code(data: MappedFile):
+        return len(data)
+
+    assert simplecli_wrap_main(code) == 0
+
+
+def test_mapped_list(monkeypatch, tmp_path):
+    paths = []
+    for name in "ab":
+        paths.append(tmp_path / name)
+        paths[-1].write_bytes(name.encode() * 3)
+    monkeypatch.setattr(sys, "argv", ["filename", *map(str, paths)])
+
+    def code(files: list[MappedFile]):
+        return [bytes(f) for f in files]
+
+    assert simplecli_wrap_main(code) == [b"aaa", b"bbb"]
+
+
+def test_mapped_missing_path(monkeypatch, tmp_path):
+    missing = tmp_path / "missing.bin"
+    monkeypatch.setattr(sys, "argv", ["filename", f"--data={missing}"])
+
+    def code(data: MappedFile):
+        pass
+
+    with pytest.raises(SystemExit) as e:
+        simplecli_wrap_main(code)
+    assert str(e.value) == (
+        f"'data' cannot open '{missing}': No such file or directory"
+    )
+
+
+def test_close_files_with_exports(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+    view = MappedFile(str(path))
+    kept = view[1:]
+    close_files([view, "other", None])
+    # Slices still exported keep the map alive, nothing is raised
+    assert bytes(kept) == b"bc"
@@ -0,0 +1,186 @@
+import os
+import pathlib
+import pytest
+import subprocess
+import sys
+from simplecli import output, simplecli
+from tests.utils import simplecli_wrap_main
+
+
+def test_generator_streamed(capfd, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "3"])
+
+    def code(count: int):
+        yield from range(count)
+
+    assert simplecli_wrap_main(code) is None
+    assert capfd.readouterr().out == "0\n1\n2\n"
+
+
+def test_iterator_streamed(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename"])
+
+    def code(sep: str = "-"):
+        return map(sep.join, [("a", "b"), ("c", "d")])
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "a-b\nc-d\n"
+
+
+def test_async_generator_streamed(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename"])
+
+    async def code(count: int = 2):
+        for i in range(count):
+            yield i
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "0\n1\n"
+
+
+def test_prints_share_buffer(capfd, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename"])
+
+    def code(count: int = 2):
+        for i in range(count):
+            print("before", i)
+            yield i
+
+    simplecli_wrap_main(code)
+    assert capfd.readouterr().out == "before 0\n0\nbefore 1\n1\n"
+
+
+def test_other_results_returned(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename"])
+
+    def code(count: int = 2):
+        return list(range(count))
+
+    assert simplecli_wrap_main(code) == [0, 1]
+
+
+def test_flush_interval(monkeypatch):
+    flushes = []
+
+    class Out:
+        def write(self, text):
+            flushes.append(text)
+
+        def flush(self):
+            flushes.append("|")
+
+    output.write_records(Out(), range(5), output.raw_line, 2)
+    assert "".join(flushes) == "0\n1\n|2\n3\n|4\n"
+    flushes.clear()
+    output.write_records(Out(), range(5), output.raw_line, 0)
+    assert "".join(flushes) == "0\n1\n2\n3\n4\n"
+
+
+def test_bad_flush(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-flush=0"])
+
+    def code():
+        yield 1
+
+    with pytest.raises(SystemExit, match="must be a positive int"):
+        simplecli_wrap_main(code)
+
+
+def test_unexpected_option(monkeypatch):
+    with pytest.raises(SystemExit, match="Unexpected argument 'simplecli_x'"):
+        output.stream_output(iter([]), {"simplecli_x": "1"})
+
+
+def test_jsonl_generator(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-output=jsonl"])
+
+    def code(count: int = 2):
+        for i in range(count):
+            yield {"n": i, "name": "é", "path": pathlib.Path("a"), "x": None}
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == (
+        '{"n":0,"name":"é","path":"a","x":null}\n'
+        '{"n":1,"name":"é","path":"a","x":null}\n'
+    )
+
+
+def test_jsonl_return_value(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-output=jsonl"])
+
+    def code(count: int = 2):
+        return list(range(count))
+
+    assert simplecli_wrap_main(code) is None
+    assert capsys.readouterr().out == "[0,1]\n"
+
+
+def test_output_none_return(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-output=tsv"])
+
+    def code():
+        pass
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize(
+    "record, line",
+    [
+        (("a", 1, None, 2.5), "a\t1\t\t2.5\n"),
+        ({"x": "tab\there", "y": "new\nline"}, "tab\\there\tnew\\nline\n"),
+        ("back\\slash", "back\\\\slash\n"),
+        (7, "7\n"),
+    ],
+)
+def test_tsv_line(record, line):
+    assert output.tsv_line(record) == line
+
+
+def test_raw_is_default(capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-output=raw"])
+
+    def code():
+        yield ("a", 1)
+
+    simplecli_wrap_main(code)
+    assert capsys.readouterr().out == "('a', 1)\n"
+
+
+def test_unknown_format(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "--simplecli-output=csv"])
+
+    def code():
+        yield 1
+
+    with pytest.raises(SystemExit, match="must be one of: jsonl, raw, tsv"):
+        simplecli_wrap_main(code)
+
+
+def test_broken_pipe(tmp_path):
+    script = tmp_path / "count.py"
+    script.write_text(
+        "import simplecli\n"
+        "import sys\n\n\n"
+        "@simplecli.wrap\n"
+        "def main(count: int = 10_000_000):\n"
+        "    try:\n"
+        "        yield from range(count)\n"
+        "    finally:\n"
+        "        print('closed', file=sys.stderr)\n"
+    )
+    root = os.path.dirname(os.path.dirname(simplecli.__file__))
+    env = {**os.environ, "PYTHONPATH": root}
+    proc = subprocess.Popen(
+        [sys.executable, str(script)],  # noqa: S603
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    assert proc.stdout.readline() == b"0\n"
+    proc.stdout.close()
+    stderr = proc.stderr.read().decode()
+    proc.wait()
+    assert proc.returncode == 1
+    assert stderr == "closed\n"
@@ -1,7 +1,13 @@
 from __future__ import annotations
 import pytest
 import re
-from simplecli.simplecli import DefaultIfBool, Empty, Param, UnsupportedType
+from simplecli.simplecli import (
+    DefaultIfBool,
+    Empty,
+    Param,
+    ParamInfo,
+    UnsupportedType,
+)
 from tests.utils import skip_if_uniontype_unsupported
 from typing import Optional, Union
 
@@ -74,7 +80,7 @@ def test_set_value():
     with pytest.raises(ValueError, match="[int, float]"):
         p1.set_value("this is the value")
 
-    with pytest.raises(TypeError, match="[int, float]"):
+    with pytest.raises(ValueError, match="requires a value"):
         p1.set_value(DefaultIfBool)
     assert p1.value is Empty
     p1.set_value(3)
@@ -100,6 +106,32 @@ def test_set_value():
         p3.set_value(DefaultIfBool)
 
 
+def test_set_value_union_first_match():
+    p1 = Param(name="testparam1", annotation=Union[int, str])
+    p1.set_value("5")
+    assert p1.value == 5
+    p1.set_value("five")
+    assert p1.value == "five"
+
+    p2 = Param(name="testparam2", annotation=Union[str, int])
+    p2.set_value("5")
+    assert p2.value == "5"
+
+    p3 = Param(name="testparam3", annotation=Optional[float])
+    p3.set_value("1.5")
+    assert p3.value == 1.5
+
+
+def test_set_value_as_seq_converts_once():
+    p1 = Param(name="testparam1", annotation=set[int])
+    p1.set_value_as_seq(iter(["1", "2", "2"]))
+    assert p1.value == {1, 2}
+
+    p2 = Param(name="testparam2", annotation=list[float])
+    with pytest.raises(ValueError, match="float"):
+        p2.set_value_as_seq(["1", "two"])
+
+
 def test_union():
     p1 = Param(name="testparam1", annotation=Union[str, float])
     assert p1.datatypes == [str, float]
@@ -212,3 +244,25 @@ def test_param_set_value_as_seq_invalid():
         p1.set_value_as_seq([123, "bar"])
     assert p1.required is True
     assert p1.optional is False
+
+
+def test_param_spec_precomputed():
+    p1 = Param(name="test_param", annotation=Optional[int])
+    spec = p1.spec
+    assert isinstance(spec, ParamInfo)
+    assert spec.datatypes == (int, type(None))
+    assert spec.help_name == "test-param"
+    assert spec.help_type == "[int, NoneType]"
+    assert spec.optional is True
+    assert spec.required is False
+    assert spec.is_seq is False
+    assert p1.spec is spec
+
+
+def test_param_spec_frozen():
+    spec = Param(name="testparam1", annotation=list[int]).spec
+    assert spec.is_seq is True
+    assert spec.origin is list
+    with pytest.raises(AttributeError, match="frozen"):
+        spec.required = False
+    assert not hasattr(spec, "__dict__")
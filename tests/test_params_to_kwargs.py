@@ -1,5 +1,6 @@
 import pytest
-from simplecli.simplecli import Param, params_to_kwargs
+from typing import NoReturn
+from simplecli.simplecli import Param, clean_args, params_to_kwargs
 
 
 def test_positional():
@@ -44,3 +45,56 @@ def test_unknown_arg():
             kw_args={"foo": "bar"},
         )
     assert "Unexpected argument" in str(e.value.args)
+
+
+def test_positional_cursor_leaves_input():
+    p1 = Param(name="testparam1", annotation=str)
+    p2 = Param(name="testparam2", annotation=list[str])
+    pos_args = ["foo", "bar", "baz"]
+    argdict = params_to_kwargs(params=[p1, p2], pos_args=pos_args, kw_args={})
+    assert argdict == {"testparam1": "foo", "testparam2": ["bar", "baz"]}
+    assert pos_args == ["foo", "bar", "baz"]
+
+
+def test_too_many_positional():
+    p1 = Param(name="testparam1", annotation=str)
+    with pytest.raises(TypeError, match="Too many positional"):
+        params_to_kwargs(params=[p1], pos_args=["foo", "bar"], kw_args={})
+
+
+class IterateOnly(list):
+    # Fails on the operations that made binding quadratic, like `pop(0)`
+    def pop(self, *args: object) -> NoReturn:
+        raise AssertionError("pop")
+
+    def __getitem__(self, index) -> NoReturn:
+        raise AssertionError("indexed")
+
+
+def test_streamed_positionals():
+    p1 = Param(name="first", annotation=str)
+    p2 = Param(name="rest", annotation=list[int])
+    stream = (str(i) for i in range(5))
+    argdict = params_to_kwargs(params=[p1, p2], pos_args=stream, kw_args={})
+    assert argdict == {"first": "0", "rest": [1, 2, 3, 4]}
+
+
+def test_parse_reads_each_argument_once():
+    count = 200_000
+    reads = []
+
+    def source():
+        for i in range(count):
+            reads.append(i)
+            yield str(i)
+
+    params = [
+        Param(name="values", annotation=list[str]),
+        Param(name="flag", annotation=bool),
+    ]
+    pos_args, kw_args = clean_args(IterateOnly([*source(), "--flag"]))
+    argdict = params_to_kwargs(params, IterateOnly(pos_args), kw_args)
+    # A single pass, without popping or indexing into the arguments
+    assert len(reads) == count
+    assert argdict["flag"] is True
+    assert len(argdict["values"]) == count
@@ -1,4 +1,7 @@
-from simplecli.simplecli import DefaultIfBool, clean_args
+import io
+import os
+import pytest
+from simplecli.simplecli import DefaultIfBool, clean_args, read_nul_args
 
 
 def test_clean_args_empty():
@@ -29,3 +32,52 @@ def test_clean_args_hyphen_to_underscore():
 
 def test_clean_args_positional():
     assert clean_args(["foo", "bar"]) == (["foo", "bar"], {})
+
+
+def test_clean_args_arg_file(tmp_path):
+    arg_file = tmp_path / "args.txt"
+    arg_file.write_text("foo bar\n\n--baz=1\n@nested\n")
+    assert clean_args(["a", f"@{arg_file}", "b"]) == (
+        ["a", "foo bar", "@nested", "b"],
+        {"baz": "1"},
+    )
+
+
+def test_clean_args_escaped_at():
+    assert clean_args(["@@foo", "@"]) == (["@foo", "@"], {})
+
+
+def test_clean_args_missing_arg_file_is_literal(tmp_path):
+    missing = tmp_path / "missing.txt"
+    assert clean_args([f"@{missing}", "@someone", f"@{tmp_path}"]) == (
+        [f"@{missing}", "@someone", f"@{tmp_path}"],
+        {},
+    )
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/fd"), reason="needs /dev/fd")
+def test_clean_args_pipe_arg_file():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"foo\n--baz=1\n")
+    os.close(write_fd)
+    try:
+        assert clean_args(["a", f"@/dev/fd/{read_fd}"]) == (
+            ["a", "foo"],
+            {"baz": "1"},
+        )
+    finally:
+        os.close(read_fd)
+
+
+def test_read_nul_args_chunks():
+    stream = io.BytesIO(b"a b\0c\xff\0\0d")
+    assert list(read_nul_args(stream, chunk_size=2)) == [
+        "a b",
+        "c\udcff",
+        "",
+        "d",
+    ]
+
+
+def test_read_nul_args_text():
+    assert list(read_nul_args(io.StringIO("x\0y\0"))) == ["x", "y"]
@@ -0,0 +1,86 @@
+import importlib.util
+import linecache
+import os
+import py_compile
+import pytest
+import subprocess
+import sys
+from simplecli import simplecli
+
+
+SCRIPT = '''
+import simplecli
+__version__ = "1.2"
+
+
+@simplecli.wrap
+def main(
+    foo: int,  # the foo
+    bar: str = "baz",  # the bar
+):
+    """
+    Does things
+    """
+    print(foo * 2, bar)
+'''
+
+UNSUPPORTED = """
+def main(
+    foo: complex,  # the foo
+):
+    pass
+"""
+
+
+def sourceless(tmp_path, source):
+    path = tmp_path / "script.py"
+    path.write_text(source)
+    compiled = tmp_path / "script.pyc"
+    py_compile.compile(str(path), str(compiled), doraise=True)
+    spec = importlib.util.spec_from_file_location("script", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    path.unlink()
+    linecache.clearcache()
+    return module.main, compiled
+
+
+def test_extract_without_source(tmp_path):
+    main, _ = sourceless(tmp_path, SCRIPT.replace("@simplecli.wrap", ""))
+    params = simplecli.extract_code_params(main)
+    assert [p.name for p in params] == ["foo", "bar"]
+    assert [p.description for p in params] == ["", ""]
+    assert params[0].annotation is int
+    assert params[1].default == "baz"
+
+
+def test_unsupported_without_source(tmp_path):
+    main, _ = sourceless(tmp_path, UNSUPPORTED)
+    with pytest.raises(simplecli.UnsupportedType) as e:
+        simplecli.extract_code_params(main)
+    with pytest.raises(SystemExit, match="line 2\nUnsupportedType") as e2:
+        simplecli.unsupported_type_exit(main, "script.py", e.value)
+    assert "Traceback" not in str(e2.value)
+
+
+def test_run_pyc_only(tmp_path):
+    _, compiled = sourceless(tmp_path, SCRIPT)
+    root = os.path.dirname(os.path.dirname(simplecli.__file__))
+    env = {**os.environ, "PYTHONPATH": root}
+    run = [sys.executable, str(compiled)]
+    result = subprocess.run(
+        [*run, "4", "--bar=qux"],  # noqa: S603
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert result.stdout == "8 qux\n"
+    result = subprocess.run(
+        [*run, "--help"],  # noqa: S603
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    # Help is printed via `sys.exit`
+    assert "Does things" in result.stderr
+    assert "--foo" in result.stderr
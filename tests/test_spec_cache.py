@@ -0,0 +1,110 @@
+import importlib.util
+import os
+import pytest
+import threading
+from simplecli import simplecli
+
+
+SCRIPT = """
+def code(
+    foo: int,  # the foo
+    bar: str = "baz",  # the bar
+):
+    pass
+"""
+
+
+def load_script(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.code
+
+
+@pytest.fixture
+def script(tmp_path, monkeypatch):
+    monkeypatch.delenv(simplecli.CACHE_DISABLE_ENV, raising=False)
+    monkeypatch.setattr(simplecli.sys, "dont_write_bytecode", False)
+    path = tmp_path / "script.py"
+    path.write_text(SCRIPT)
+    return path
+
+
+def no_extraction(code):
+    raise AssertionError("extract_code_params should not be called")
+
+
+def test_cache_written(script):
+    params = simplecli.load_code_params(load_script(script))
+    assert os.path.isfile(simplecli.spec_cache_path(str(script)))
+    assert [p.description for p in params] == ["the foo", "the bar"]
+
+
+def test_cache_warm_start(script, monkeypatch):
+    code = load_script(script)
+    cold = simplecli.load_code_params(code)
+    monkeypatch.setattr(simplecli, "extract_code_params", no_extraction)
+    warm = simplecli.load_code_params(code)
+    assert warm == cold
+    assert warm[1].default == "baz"
+    assert warm[0].required is True
+
+
+def test_cache_touched_unchanged(script, monkeypatch):
+    code = load_script(script)
+    simplecli.load_code_params(code)
+    os.utime(script, ns=(1, 1))
+    monkeypatch.setattr(simplecli, "extract_code_params", no_extraction)
+    assert simplecli.load_code_params(code)[0].description == "the foo"
+
+
+def test_cache_invalidated(script):
+    simplecli.load_code_params(load_script(script))
+    script.write_text(SCRIPT.replace("the foo", "a new foo"))
+    os.utime(script, ns=(2, 2))
+    params = simplecli.load_code_params(load_script(script))
+    assert params[0].description == "a new foo"
+
+
+def test_cache_disabled(script, monkeypatch):
+    monkeypatch.setenv(simplecli.CACHE_DISABLE_ENV, "1")
+    simplecli.load_code_params(load_script(script))
+    assert not os.path.exists(simplecli.spec_cache_path(str(script)))
+
+
+def test_cache_corrupt(script):
+    code = load_script(script)
+    simplecli.load_code_params(code)
+    with open(simplecli.spec_cache_path(str(script)), "wb") as f:
+        f.write(b"\x00not a cache")
+    assert simplecli.load_code_params(code)[1].description == "the bar"
+
+
+def test_invoke_writes_no_cache(script):
+    code = load_script(script)
+    assert simplecli.invoke(code, ["1"]) is None
+    assert not os.path.exists(simplecli.spec_cache_path(str(script)))
+
+
+def test_concurrent_writes(script):
+    code = load_script(script)
+    cache_dir = os.path.dirname(simplecli.spec_cache_path(str(script)))
+    errors = []
+
+    def write():
+        try:
+            for _ in range(50):
+                os.utime(script, ns=(3, 3))
+                simplecli.load_code_params(code)
+        except BaseException as e:  # Reported from the main thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    # Every writer renamed its own temporary file into place
+    assert not [name for name in os.listdir(cache_dir) if ".tmp" in name]
+    assert simplecli.load_code_params(code)[0].description == "the foo"
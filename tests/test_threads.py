@@ -0,0 +1,124 @@
+import pytest
+import sys
+import threading
+import simplecli as package
+from concurrent.futures import ThreadPoolExecutor
+from simplecli import simplecli
+from simplecli.simplecli import (
+    ArgumentError,
+    DefaultIfBool,
+    Empty,
+    Param,
+    bind_params,
+)
+
+THREADS = 8
+CALLS = 2000
+
+
+def scale(a: int, tags: list[str], factor: float = 1.0) -> tuple:
+    return a, factor, tags
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # Switch threads as often as possible, to interleave binding steps
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, count=THREADS):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run(index):
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as e:  # Reported from the main thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_shared_params_bind_concurrently():
+    params = [
+        Param(name="a", annotation=int),
+        Param(name="rest", annotation=list[int]),
+        Param(name="flag", annotation=bool),
+    ]
+
+    def bind_many(index):
+        for call in range(CALLS):
+            number = index * CALLS + call
+            flag = {"flag": DefaultIfBool} if call % 2 else {}
+            kwargs = bind_params(params, [str(number), "1", str(call)], flag)
+            assert kwargs == {
+                "a": number,
+                "rest": [1, call],
+                "flag": bool(call % 2),
+            }
+
+    run_threads(bind_many)
+    # Nothing was stored on the shared params
+    assert [param.value for param in params] == [Empty, Empty, False]
+
+
+def test_concurrent_invoke():
+    def call(index):
+        tags = [f"t{index}"] * (index % 3)
+        argv = [str(index), f"--factor={index / 2}", *tags]
+        return package.invoke(scale, argv)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(call, range(CALLS * 2)))
+    for index, result in enumerate(results):
+        tags = [f"t{index}"] * (index % 3)
+        assert result == (index, index / 2, tags)
+
+
+def test_concurrent_errors():
+    def call(index):
+        argv = [str(index)] if index % 2 else ["x", f"--nope{index}"]
+        try:
+            return package.invoke(scale, argv)
+        except ArgumentError as e:
+            return e.kind, e.params
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(call, range(CALLS)))
+    for index, result in enumerate(results):
+        if index % 2:
+            assert result == (index, 1.0, [])
+        else:
+            assert result == ("invalid", ["a"])
+
+
+def test_invoke_loads_params_once(monkeypatch):
+    loads = []
+    function_params = simplecli.function_params
+
+    def counting_params(func):
+        loads.append(func)
+        return function_params(func)
+
+    def code(a: int, tags: list[str]) -> tuple:
+        return a, tags
+
+    monkeypatch.setattr(simplecli, "function_params", counting_params)
+    package.invoke(code, ["0"])
+
+    def call_many(index):
+        for call in range(CALLS // THREADS):
+            assert package.invoke(code, [str(call), "x"]) == (call, ["x"])
+
+    run_threads(call_many)
+    # Threads share the cached params, nothing is parsed again or copied
+    assert loads == [code]
@@ -1,20 +1,9 @@
+import io
 import pytest
 import sys
 import typing
 from simplecli import simplecli
-from tests.utils import skip_if_uniontype_unsupported
-
-
-@pytest.fixture(autouse=True)
-def ensure_wrapped_not_flagged():
-    simplecli._wrapped = False
-
-
-def simplecli_wrap_main(code):
-    code_name = code.__globals__["__name__"]
-    code.__globals__["__name__"] = "__main__"
-    simplecli.wrap(code)
-    code.__globals__["__name__"] = code_name
+from tests.utils import simplecli_wrap_main, skip_if_uniontype_unsupported
 
 
 def test_wrap_simple(monkeypatch):
@@ -318,3 +307,25 @@ def test_wrap_set_of_ints_same(capfd, monkeypatch):
 
     simplecli_wrap_main(code1)
     assert capfd.readouterr().out == "9\n"
+
+
+def test_args0_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["filename", "x", "--simplecli-args0"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("--a\0b c\0"))
+
+    def code(first: str, rest: list[str]):
+        assert first == "x"
+        assert rest == ["--a", "b c"]
+
+    simplecli_wrap_main(code)
+
+
+def test_args0_file(monkeypatch, tmp_path):
+    args = tmp_path / "args0"
+    args.write_bytes(b"1\x002\x003")
+    monkeypatch.setattr(sys, "argv", ["filename", f"--simplecli-args0={args}"])
+
+    def code(numbers: set[int]):
+        assert numbers == {1, 2, 3}
+
+    simplecli_wrap_main(code)
@@ -2,6 +2,7 @@ import sys
 import pytest
 from functools import wraps
 from typing import Any, Callable
+from simplecli import simplecli
 
 
 def min_py(major: int, minor: int) -> bool:
@@ -19,3 +20,13 @@ def skip_if_uniontype_unsupported(
         return func(*args, **kwargs)
 
     return wrapper
+
+
+def simplecli_wrap_main(code: Callable[..., Any]) -> Any:  # noqa: ANN401
+    # Runs `wrap` as if `code` was defined in the script being run
+    code_name = code.__globals__["__name__"]
+    code.__globals__["__name__"] = "__main__"
+    try:
+        return simplecli.wrap(code)
+    finally:
+        code.__globals__["__name__"] = code_name